@@ -14,11 +14,24 @@ import bpy
 from bpy.app.handlers import persistent
 import mathutils
 import struct
+import math
 import numpy as np
 import os
+import zlib
+import argparse
+import json
+import hashlib
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import contextlib
+import cProfile
+import tracemalloc
+import traceback
 
 # With help from:
-# https://stackoverflow.com/questions/54464682/best-way-to-undo-previous-steps-in-a-series-of-steps
 # https://stackoverflow.com/questions/37335653/unable-to-completely-deselect-all-objects-in-blender-using-scripting-or-key-a
 # https://blender.stackexchange.com/questions/200341/apply-modifiers-in-all-objects-at-once
 # https://github.com/CheeryLee/blender_apply_modifiers/blob/master/apply_modifiers.py
@@ -28,519 +41,2309 @@ import os
 VF_delivery_object_types = ['CURVE', 'MESH', 'META', 'SURFACE', 'FONT']
 # Not all types are supported by all exporters, see the GitHub documentation for more details
 
+# Define volume field requirements
+VF_volume_attribute = 'field_vector'
+VF_volume_limit = 65536 # Default point limit, can be raised in the delivery settings
+
 ###########################################################################
-# Main class
+# Volume field helpers
 
-class VFDELIVERY_OT_file(bpy.types.Operator):
-	bl_idname = "vfdelivery.file"
-	bl_label = "Deliver File"
-	bl_description = "Quickly export selected objects or collection to a specified directory"
-#	bl_options = {'REGISTER', 'UNDO'}
+# Remap values from the start and stop range to 0-1
+def vf_remap(val, start, stop):
+	val = (val - start) / (stop - start)
+	return val
+
+# Validate the active object and return the evaluated object along with the grid dimensions
+def vf_volume_object(context):
+	obj = context.object
+	limit = context.scene.vf_delivery_settings.volume_limit
 	
-	def remap(self, val, start, stop):
-		val = (val - start) / (stop - start)
-		return val
+	# Ensure the selected object is a mesh with equal to or fewer than the vertex limit and the necessary properties
+	if not (obj and obj.type == 'MESH' and len(obj.data.vertices) <= limit and obj.data.get('vf_point_grid_x') is not None and obj.data.get('vf_point_grid_y') is not None and obj.data.get('vf_point_grid_z') is not None):
+		print(f"Selected object is not a mesh")
+		return None, None
 	
-	def execute(self, context):
-		# Set up local variables
-		location = bpy.path.abspath(bpy.context.scene.vf_delivery_settings.file_location)
-		format = bpy.context.scene.vf_delivery_settings.file_type
-		file_format = "." + format.lower().split("-")[0] # Get only the characters before a dash to support multiple variations of a single format
-		combined = True if bpy.context.scene.vf_delivery_settings.file_grouping == "COMBINED" else False
-		active_object = bpy.context.active_object
-		
-		# Create directory if it doesn't exist yet
-		if not os.path.exists(location):
-			os.makedirs(location)
-		
-		# Save then override the current mode to OBJECT
-		if active_object is not None:
-			object_mode = active_object.mode
-			bpy.ops.object.mode_set(mode = 'OBJECT')
-		
-		# Check if at least one object is selected, if not, convert selected collection into object selection
-		if bpy.context.object and bpy.context.object.select_get():
-			file_name = active_object.name
+	# Get evaluated object
+	obj = context.evaluated_depsgraph_get().objects.get(obj.name)
+	grid = (obj.data["vf_point_grid_x"], obj.data["vf_point_grid_y"], obj.data["vf_point_grid_z"])
+	return obj, grid
+
+# Read a float or vector attribute in a single bulk copy
+# Returns a float32 array of shape (points) for values or (points, 3) for vectors, already swizzled to XZY order for Unity
+def vf_read_attribute(obj, attribute_name, grid=None, out=None):
+	attribute = obj.data.attributes.get(attribute_name)
+	if attribute is None:
+		print(f"Selected object does not contain '{attribute_name}' values.")
+		return None
+	
+	# Determine the element layout once from the attribute type instead of testing each element
+	if attribute.data_type == 'FLOAT':
+		key, width = 'value', 1
+	elif attribute.data_type == 'FLOAT_VECTOR':
+		key, width = 'vector', 3
+	else:
+		print(f"Values not found in '{attribute_name}' attribute.")
+		return None
+	
+	count = len(attribute.data)
+	if grid is not None and count != grid[0] * grid[1] * grid[2]:
+		print(f"Attribute '{attribute_name}' contains {count} values, but the point grid requires {grid[0] * grid[1] * grid[2]}.")
+		return None
+	
+	# Copy everything into a preallocated buffer with one call (reusing the previous frame's buffer when it matches)
+	if out is not None and out.size == count * width:
+		buffer = out.reshape(-1)
+	else:
+		buffer = np.empty(count * width, dtype=np.float32)
+	attribute.data.foreach_get(key, buffer)
+	
+	if width == 1:
+		return buffer
+	
+	# Swizzle XZY order for Blender to Unity coordinate conversion (swapped in place, no additional copy)
+	buffer = buffer.reshape((count, 3))
+	buffer[:, 1:3] = buffer[:, 2:0:-1]
+	return buffer
+
+###########################################################################
+# Volume field file encoding
+
+# Unity volume field header: FourCC followed by three uint16 dimensions
+VF_header = struct.Struct('<4sHHH')
+VF_fourcc_channels = {b'VF_F': 1, b'VF_V': 3}
+
+# Write a Unity .vf file with the header and the contiguous little-endian float32 payload in two buffered writes
+def vf_write_volume_field(filepath, array, size):
+	payload = np.ascontiguousarray(array, dtype='<f4')
+	fourcc = b'VF_F' if payload.ndim == 1 else b'VF_V'
+	with open(filepath, 'wb') as file:
+		file.write(VF_header.pack(fourcc, *size))
+		file.write(memoryview(payload).cast('B'))
+
+# Memory-map an existing .vf file after validating the header against the payload length
+# Version 2 containers are detected by their magic and read with vf_read_volume_field_v2
+# Returns the FourCC, the (x, y, z) dimensions, and a read-only array view shaped (z, y, x) or (z, y, x, 3)
+def vf_read_volume_field(filepath):
+	with open(filepath, 'rb') as file:
+		header = file.read(VF_header.size)
+	if len(header) < VF_header.size:
+		raise ValueError(f"{filepath} is too short to contain a volume field header")
+	
+	if header[:4] == VF2_magic:
+		return vf_read_volume_field_v2(filepath)
+	
+	fourcc, size_x, size_y, size_z = VF_header.unpack(header)
+	if fourcc not in VF_fourcc_channels:
+		raise ValueError(f"{filepath} has an unrecognised FourCC {fourcc!r}")
+	
+	channels = VF_fourcc_channels[fourcc]
+	expected = size_x * size_y * size_z * channels * 4
+	payload = os.path.getsize(filepath) - VF_header.size
+	if payload != expected:
+		raise ValueError(f"{filepath} payload is {payload} bytes, but {size_x} x {size_y} x {size_z} {fourcc.decode()} requires {expected}")
+	
+	shape = (size_z, size_y, size_x) if channels == 1 else (size_z, size_y, size_x, channels)
+	data = np.memmap(filepath, dtype='<f4', mode='r', offset=VF_header.size, shape=shape)
+	return fourcc.decode(), (size_x, size_y, size_z), data
+
+# Compare two .vf files, returning the largest absolute difference between them
+def vf_diff_volume_field(filepath_a, filepath_b):
+	fourcc_a, size_a, data_a = vf_read_volume_field(filepath_a)
+	fourcc_b, size_b, data_b = vf_read_volume_field(filepath_b)
+	if fourcc_a != fourcc_b or size_a != size_b:
+		raise ValueError(f"{filepath_a} ({fourcc_a} {size_a}) and {filepath_b} ({fourcc_b} {size_b}) are not comparable")
+	return float(np.max(np.abs(data_a - data_b))) if data_a.size else 0.0
+
+# Versioned volume field container (v2)
+# The magic deliberately differs from the v1 'VF_V' and 'VF_F' FourCC codes so older readers reject it cleanly
+# Header: magic, version, channels (1 or 3), bytes per component (4 or 2), compression (0 none, 1 zlib), layout (0 dense, 1 sparse bricks), uint32 dimensions, uint32 frame count
+# Each frame follows as a uint64 byte length and the (optionally compressed) little-endian payload
+VF2_magic = b'VF_2'
+VF2_version = 2
+VF2_header = struct.Struct('<4sHBBBB2xIIII')
+VF2_chunk = struct.Struct('<Q')
+VF2_precision = {'FLOAT32': '<f4', 'FLOAT16': '<f2'}
+
+# Sparse brick payload (layout 1): brick edge length, uniform value count, and stored brick count
+# Followed by an int32 index for every brick in (z, y, x) order, the uniform values, and the stored bricks (each z, y, x, channels)
+# Index entries of zero or more point to a stored brick, negative entries to uniform value -(entry + 1)
+VF2_bricks = struct.Struct('<III')
+
+# Split a volume into cubic bricks, storing only bricks that vary and a shared value for each distinct uniform (including empty) brick
+# The grid is padded to whole bricks by repeating its edges, so partial bricks at the boundary can still be uniform
+# Bricks are compared bitwise, so decoding reproduces the dense payload exactly (including signed zeros and NaN values)
+def vf_brick_encode(array, size, brick, dtype):
+	size_x, size_y, size_z = size
+	channels = 1 if array.ndim == 1 else 3
+	grid = np.asarray(array, dtype=dtype).reshape((size_z, size_y, size_x, channels))
+	counts = [-(-length // brick) for length in (size_z, size_y, size_x)]
+	if any(count * brick != length for count, length in zip(counts, grid.shape)):
+		grid = np.pad(grid, [(0, count * brick - length) for count, length in zip(counts, grid.shape)] + [(0, 0)], mode='edge')
+	
+	# View the grid as (brick z, z, brick y, y, brick x, x, channels) without copying, then compare every brick to its first value
+	bricks = grid.reshape((counts[0], brick, counts[1], brick, counts[2], brick, channels))
+	bits = bricks.view('<u' + str(grid.dtype.itemsize))
+	uniform = (bits == bits[:, :1, :, :1, :, :1]).all(axis=(1, 3, 5, 6))
+	
+	# Deduplicate the uniform values, so empty space shares one entry
+	values, inverse = np.unique(bits[:, 0, :, 0, :, 0][uniform], axis=0, return_inverse=True)
+	index = np.empty(counts, dtype='<i4')
+	index[uniform] = -1 - inverse.reshape(-1)
+	stored = bricks.transpose((0, 2, 4, 1, 3, 5, 6))[~uniform]
+	index[~uniform] = np.arange(len(stored))
+	
+	return b''.join((VF2_bricks.pack(brick, len(values), len(stored)), index.data, np.ascontiguousarray(values.view(grid.dtype)).data, np.ascontiguousarray(stored).data))
+
+# Expand a sparse brick payload back into the dense (z, y, x) or (z, y, x, channels) layout
+def vf_brick_decode(payload, size, channels, dtype):
+	size_x, size_y, size_z = size
+	if len(payload) < VF2_bricks.size:
+		raise ValueError("sparse volume payload is too short to contain a brick header")
+	brick, uniform_count, stored_count = VF2_bricks.unpack_from(payload)
+	if brick == 0:
+		raise ValueError("sparse volume payload has a brick size of zero")
+	counts = [-(-length // brick) for length in (size_z, size_y, size_x)]
+	lengths = [counts[0] * counts[1] * counts[2] * 4, uniform_count * channels * dtype.itemsize, stored_count * brick ** 3 * channels * dtype.itemsize]
+	if len(payload) != VF2_bricks.size + sum(lengths):
+		raise ValueError(f"sparse volume payload is {len(payload)} bytes, but its brick header requires {VF2_bricks.size + sum(lengths)}")
+	
+	offset = VF2_bricks.size
+	index = np.frombuffer(payload, dtype='<i4', count=lengths[0] // 4, offset=offset)
+	offset += lengths[0]
+	values = np.frombuffer(payload, dtype=dtype, count=uniform_count * channels, offset=offset).reshape((uniform_count, channels))
+	offset += lengths[1]
+	stored = np.frombuffer(payload, dtype=dtype, count=stored_count * brick ** 3 * channels, offset=offset).reshape((stored_count, brick, brick, brick, channels))
+	if index.size and (index.max() >= stored_count or index.min() < -uniform_count):
+		raise ValueError("sparse volume payload has a brick index out of range")
+	
+	bricks = np.empty((index.size, brick, brick, brick, channels), dtype=dtype)
+	mask = index >= 0
+	bricks[mask] = stored[index[mask]]
+	bricks[~mask] = values[-1 - index[~mask]][:, None, None, None, :]
+	
+	# Interleave the bricks back into the padded grid and crop to the volume size
+	grid = bricks.reshape((counts[0], counts[1], counts[2], brick, brick, brick, channels)).transpose((0, 3, 1, 4, 2, 5, 6))
+	grid = grid.reshape((counts[0] * brick, counts[1] * brick, counts[2] * brick, channels))[:size_z, :size_y, :size_x]
+	return grid[..., 0] if channels == 1 else grid
+
+# Stream frames into a v2 container, optionally using the sparse brick layout with the given brick edge length
+class VFVolumeFieldWriter:
+	def __init__(self, filepath, size, channels, precision='FLOAT32', compression=False, brick=0):
+		self.size = tuple(size)
+		self.channels = channels
+		self.dtype = np.dtype(VF2_precision[precision])
+		self.compression = 1 if compression else 0
+		self.brick = brick
+		self.frames = 0
+		self.filepath = filepath
+		self.file = open(filepath, 'wb')
+		self.write_header()
+	
+	def write_header(self):
+		self.file.write(VF2_header.pack(VF2_magic, VF2_version, self.channels, self.dtype.itemsize, self.compression, 1 if self.brick else 0, *self.size, self.frames))
+	
+	def write_frame(self, array):
+		if self.brick:
+			payload = vf_brick_encode(array, self.size, self.brick, self.dtype)
 		else:
-			file_name = bpy.context.collection.name
-			for obj in bpy.context.collection.all_objects:
-				obj.select_set(True)
+			payload = np.ascontiguousarray(array, dtype=self.dtype)
+			payload = memoryview(payload).cast('B')
+		if self.compression:
+			payload = zlib.compress(payload)
+		self.file.write(VF2_chunk.pack(len(payload)))
+		self.file.write(payload)
+		self.frames += 1
+	
+	def close(self):
+		if self.file.closed:
+			return
+		# Patch the final frame count into the header
+		self.file.seek(0)
+		self.write_header()
+		self.file.close()
+	
+	def __enter__(self):
+		return self
+	
+	def __exit__(self, *args):
+		self.close()
+
+# Write a single frame volume field using the v2 container
+def vf_write_volume_field_v2(filepath, array, size, precision='FLOAT32', compression=False, brick=0):
+	with VFVolumeFieldWriter(filepath, size, 1 if array.ndim == 1 else 3, precision, compression, brick) as writer:
+		writer.write_frame(array)
+
+# Read a v2 container, returning the equivalent v1 FourCC, the (x, y, z) dimensions, and the payload
+# Uncompressed dense payloads are memory-mapped, sparse payloads are expanded to the dense layout
+# Multiple frames are returned with an additional leading frame axis
+def vf_read_volume_field_v2(filepath):
+	file_size = os.path.getsize(filepath)
+	with open(filepath, 'rb') as file:
+		header = file.read(VF2_header.size)
+		if len(header) < VF2_header.size:
+			raise ValueError(f"{filepath} is too short to contain a volume field header")
 		
-		if format != "CSV-1":
-			# Push an undo state (seems easier than trying to re-select previously selected non-mesh objects)
-			bpy.ops.ed.undo_push()
-			
-			# Deselect any non-mesh objects
-			for obj in bpy.context.selected_objects:
-				if obj.type not in VF_delivery_object_types:
-					obj.select_set(False)
+		magic, version, channels, itemsize, compression, layout, size_x, size_y, size_z, frames = VF2_header.unpack(header)
+		if magic != VF2_magic or version != VF2_version:
+			raise ValueError(f"{filepath} is not a version {VF2_version} volume field")
+		if channels not in (1, 3) or itemsize not in (2, 4) or compression not in (0, 1) or layout not in (0, 1):
+			raise ValueError(f"{filepath} has an unsupported channel, precision, compression, or layout setting")
 		
-# MESH (REALTIME 3D)
+		dtype = np.dtype('<f4' if itemsize == 4 else '<f2')
+		shape = (size_z, size_y, size_x) if channels == 1 else (size_z, size_y, size_x, channels)
+		expected = size_x * size_y * size_z * channels * itemsize
 		
-		if format == "FBX" or format == "GLB" or format == "OBJ" or format == "USDZ":
-			# Push an undo state (easier than trying to re-select previously selected non-MESH objects?)
-			bpy.ops.ed.undo_push()
-			# Track number of undo steps to retrace after export is complete
-			undo_steps = 1
-			
-			# Loop through each of the selected objects
-			# But only set individual selections if file export is set to individual
-			# Otherwise loop once and exit (see the if statement at the very end)
-			for obj in bpy.context.selected_objects:
-				if not combined:
-					# deselect everything
-					for selobj in bpy.context.selected_objects:
-						selobj.select_set(False)
-					# select individual object
-					obj.select_set(True)
-					file_name = obj.name
-					# Note to future self; you probably missed the comment block just above. Please stop freaking out. When combined is true the loop is exited after the first export pass. You can stop frantically scrolling for multi-export errors, you'll just get to the end of this section and figure out the solution is already implemented. Again.
-				
-				if format == "FBX":
-					bpy.ops.export_scene.fbx(
-						filepath = location + file_name + file_format,
-						check_existing = False, # Always overwrite existing files
-						use_selection = True,
-						use_visible = True,
-						use_active_collection = False, # This is now hardcoded, as we're converting collection selection into object selection manually above
-						
-						global_scale = 1.0, # 1.0
-						apply_unit_scale = True,
-						apply_scale_options = 'FBX_SCALE_NONE', # FBX_SCALE_NONE = All Local
-						use_space_transform = True,
-						axis_forward = '-Z',
-						axis_up = 'Y',
-						object_types = {'ARMATURE', 'CAMERA', 'EMPTY', 'LIGHT', 'MESH', 'OTHER'},
-						bake_space_transform = True, # True (this is "!experimental!")
-												
-						use_mesh_modifiers = True, # Come back to this...manually trigger application of mesh modifiers and convert attributes to UV maps
-						use_mesh_modifiers_render = True,
-						mesh_smooth_type = 'OFF', # OFF = Normals Only
-						use_subsurf = False, # Seems unhelpful for realtime (until realtime supports live subdivision cross-platform)
-						use_mesh_edges = False,
-						use_tspace = False,
-						use_triangles = True, # This wasn't included in the "perfect" Unity settings, but seems logical?
-						use_custom_props = False,
-												
-						use_armature_deform_only = True, # True
-						add_leaf_bones = False, # False
-						primary_bone_axis = 'X', # X Axis
-						secondary_bone_axis = 'Y', # Y Axis
-						armature_nodetype = 'NULL',
-												
-						bake_anim = True,
-						bake_anim_use_all_bones = True,
-						bake_anim_use_nla_strips = True,
-						bake_anim_use_all_actions = True,
-						bake_anim_force_startend_keying = True, # Some recommend False, but Unity may not load animations nicely without starting keyframes
-						bake_anim_step = 1.0,
-						bake_anim_simplify_factor = 1.0,
-												
-						path_mode = 'AUTO',
-						embed_textures = False,
-						batch_mode = 'OFF',
-						use_batch_own_dir = False,
-						use_metadata = True)
-					
-				elif format == "GLB":
-					bpy.ops.export_scene.gltf(
-						filepath = location + file_name + file_format,
-						check_existing = False, # Always overwrite existing files
-						export_format = 'GLB',
-						export_copyright = '',
-						
-						export_image_format = 'JPEG',
-						export_texcoords = True,
-						export_normals = True,
-						export_draco_mesh_compression_enable = True,
-						export_draco_mesh_compression_level = 6,
-						export_draco_position_quantization = 14,
-						export_draco_normal_quantization = 10,
-						export_draco_texcoord_quantization = 12,
-						export_draco_color_quantization = 10,
-						export_draco_generic_quantization = 12,
-						
-						export_tangents = False,
-						export_materials = 'EXPORT',
-						export_colors = True,
-						use_mesh_edges = False,
-						use_mesh_vertices = False,
-						export_cameras = False,
-						
-						use_selection = True,
-						use_visible = True,
-						use_renderable = True,
-						use_active_collection = False, # This is hardcoded now, as collections are converted manually to object selections above
-						use_active_scene = False,
-						
-						export_extras = False,
-						export_yup = True,
-						export_apply = True,
-						
-						export_animations = True,
-						export_frame_range = True,
-						export_frame_step = 1,
-						export_force_sampling = True,
-						export_nla_strips = True,
-						export_def_bones = True, # Changed from default
-						export_optimize_animation_size = True, # Changed from default, may cause issues with stepped animations
-						export_current_frame = False,
-						export_skins = True,
-						export_all_influences = False,
-						
-						export_morph = True,
-						export_morph_normal = True,
-						export_morph_tangent = False,
-						
-						export_lights = False,
-						will_save_settings = False,
-						filter_glob = '*.glb;*.gltf')
-				
-				elif format == "OBJ":
-					
-					if bpy.app.version[0] < 4:
-						# Blender 3.x
-						bpy.ops.export_scene.obj(
-							filepath = location + file_name + file_format,
-							check_existing = False, # Always overwrite existing files
-							use_selection = True,
-							use_animation = False,
-							use_mesh_modifiers = True,
-							use_edges = False, # Changed from default
-							use_smooth_groups = False,
-							use_smooth_groups_bitflags = False,
-							use_normals = True,
-							use_uvs = True,
-							use_materials = True,
-							use_triangles = True, # Changed from default
-							use_nurbs = False,
-							use_vertex_groups = False,
-							use_blen_objects = True,
-							group_by_object = False,
-							group_by_material = False,
-							keep_vertex_order = True, # Changed from default
-							global_scale = 100.0,
-							path_mode = 'AUTO',
-							axis_forward = '-Z',
-							axis_up = 'Y')
-					
-					else:
-						# Blender 4.x
-						bpy.ops.wm.obj_export(
-							filepath = location + file_name + file_format,
-							check_existing = False, # Always overwrite existing files
-							export_animation = False,
-							#start_frame = bpy.context.scene.frame_start,
-							#end_frame = bpy.context.scene.frame_end,
-							forward_axis = 'NEGATIVE_Z',
-							up_axis = 'Y',
-							global_scale = 100.0,
-							apply_modifiers = True,
-							export_eval_mode = 'DAG_EVAL_RENDER', # Apply render modifiers, not viewport
-							export_selected_objects = True, # Export only selected object(s)
-							export_uv = True,
-							export_normals = True,
-							export_colors = False,
-							export_materials = True,
-							export_pbr_extensions = True, # Changed from default
-							path_mode = 'AUTO',
-							export_triangulated_mesh = True, # Changed from default
-							export_curves_as_nurbs = False,
-							export_object_groups = False,
-							export_material_groups = False,
-							export_vertex_groups = False,
-							export_smooth_groups = False,
-							smooth_group_bitflags = False)
-				
-				elif format == "USDZ":
-					bpy.ops.wm.usd_export(
-						filepath = location + file_name + file_format,
-						check_existing = False, # Changed from default
-						# Removed GUI options
-						selected_objects_only = True, # Changed from default
-						visible_objects_only = True,
-						export_animation = False, # May need to add an option for enabling animation exports depending on the project
-						export_hair = False,
-						export_uvmaps = True, # Need to test this: USD uses "st" as the default uv map name, and the exporter apparently doesn't convert Blender's default "UVmap" automatically?
-						export_normals = True,
-						export_materials = True,
-						use_instancing = False,
-						evaluation_mode = 'RENDER',
-						generate_preview_surface = True,
-						export_textures = True,
-						overwrite_textures = True, # Changed from default
-						relative_paths = True)
-				
-				# Interrupt the loop if we're exporting all objects to the same file
-				if combined:
-					break
+		if compression == 0 and layout == 0:
+			# Frames are evenly spaced, so the whole payload can be viewed without copying
+			stride = VF2_chunk.size + expected
+			if file_size != VF2_header.size + stride * frames:
+				raise ValueError(f"{filepath} payload length does not match {frames} frames of {size_x} x {size_y} x {size_z}")
+			for frame in range(frames):
+				file.seek(VF2_header.size + stride * frame)
+				if VF2_chunk.unpack(file.read(VF2_chunk.size))[0] != expected:
+					raise ValueError(f"{filepath} frame {frame} has an unexpected length")
+			buffer = np.memmap(filepath, dtype=np.uint8, mode='r')
+			item_strides = np.empty(shape, dtype=dtype).strides
+			data = np.ndarray((frames,) + shape, dtype=dtype, buffer=buffer, offset=VF2_header.size + VF2_chunk.size, strides=(stride,) + item_strides)
+		else:
+			data = np.empty((frames,) + shape, dtype=dtype)
+			for frame in range(frames):
+				chunk = file.read(VF2_chunk.size)
+				if len(chunk) < VF2_chunk.size:
+					raise ValueError(f"{filepath} is missing frame {frame}")
+				length = VF2_chunk.unpack(chunk)[0]
+				payload = file.read(length)
+				if len(payload) < length:
+					raise ValueError(f"{filepath} frame {frame} is truncated")
+				if compression:
+					payload = zlib.decompress(payload)
+				if layout == 1:
+					try:
+						data[frame] = vf_brick_decode(payload, (size_x, size_y, size_z), channels, dtype)
+					except ValueError as exc:
+						raise ValueError(f"{filepath} frame {frame}: {exc}") from None
+					continue
+				if len(payload) != expected:
+					raise ValueError(f"{filepath} frame {frame} contains {len(payload)} bytes, but {expected} are required")
+				data[frame] = np.frombuffer(payload, dtype=dtype).reshape(shape)
+	
+	fourcc = 'VF_F' if channels == 1 else 'VF_V'
+	return fourcc, (size_x, size_y, size_z), (data[0] if frames == 1 else data)
+
+###########################################################################
+# Volume field downsampling
+
+# Parse comma separated downsample factors, returning the sorted valid factors and any entries that aren't numbers greater than one
+def vf_mip_factors(factors):
+	valid = set()
+	invalid = []
+	for entry in factors.replace(' ', '').split(','):
+		if not entry:
+			continue
+		try:
+			factor = float(entry)
+		except ValueError:
+			factor = 0.0
+		if 1.0 < factor < float('inf'):
+			valid.add(factor)
+		else:
+			invalid.append(entry)
+	return sorted(valid), invalid
+
+# Grid sizes for each downsampled level, named with the suffix added to the base file name
+# A full chain halves every axis (rounding down) until the grid reaches a single point, factors divide the base grid
+def vf_volume_levels(grid, mips, factors):
+	levels = []
+	if mips == 'CHAIN':
+		level = grid
+		while max(level) > 1:
+			level = tuple(max(1, size // 2) for size in level)
+			levels.append(('_mip' + str(len(levels) + 1), level))
+	elif mips == 'FACTORS':
+		for factor in vf_mip_factors(factors)[0]:
+			levels.append(('_down' + ('%g' % factor), tuple(max(1, int(round(size / factor))) for size in grid)))
+	return levels
+
+# One dimensional weights (target, source) for resampling an axis
+# Box averages the source cells covered by each target cell (weighted by overlap), trilinear interpolates at the target cell centres
+def vf_resample_weights(source, target, filter):
+	if filter == 'BOX':
+		scale = source / target
+		edges = np.arange(target + 1) * scale
+		cells = np.arange(source)
+		overlap = np.minimum(edges[1:, np.newaxis], cells + 1) - np.maximum(edges[:-1, np.newaxis], cells)
+		return (np.clip(overlap, 0.0, None) / scale).astype(np.float32)
+	
+	position = np.clip((np.arange(target) + 0.5) * source / target - 0.5, 0.0, source - 1)
+	lower = np.floor(position).astype(np.intp)
+	upper = np.minimum(lower + 1, source - 1)
+	fraction = (position - lower).astype(np.float32)
+	weights = np.zeros((target, source), dtype=np.float32)
+	np.add.at(weights, (np.arange(target), lower), 1.0 - fraction)
+	np.add.at(weights, (np.arange(target), upper), fraction)
+	return weights
+
+# Resample point ordered values or vectors from one (grid_x, grid_y, grid_z) grid to another
+# Each axis is reduced in turn with a separable weight matrix, so the cost is dominated by the first (largest) pass
+def vf_downsample(array, grid, target, filter='BOX'):
+	grid_x, grid_y, grid_z = grid
+	target_x, target_y, target_z = target
+	volume = array.reshape((grid_y, grid_z, grid_x, -1))
+	volume = np.einsum('ay,yzxc->azxc', vf_resample_weights(grid_y, target_y, filter), volume)
+	volume = np.einsum('bz,azxc->abxc', vf_resample_weights(grid_z, target_z, filter), volume)
+	volume = np.einsum('cx,abxd->abcd', vf_resample_weights(grid_x, target_x, filter), volume)
+	volume = volume.reshape((target_x * target_y * target_z, -1))
+	return volume[:, 0] if array.ndim == 1 else volume
+
+###########################################################################
+# Texture strip encoding
+
+# View point ordered data (points, channels) as a top-down strip (grid_z, grid_y, grid_x, channels) without copying
+# Swizzle ZY order for Unity coordinate system: each row holds one vertical slice, with depth slices placed side by side
+def vf_strip_view(array, grid):
+	grid_x, grid_y, grid_z = grid
+	return array.reshape((grid_y, grid_z, grid_x, -1)).transpose((1, 0, 2, 3))[::-1]
+
+# Arrange point ordered pixels (points, channels) into a top-down image strip (grid_z, grid_x * grid_y, channels)
+def vf_strip_image(pixels, grid):
+	grid_x, grid_y, grid_z = grid
+	return vf_strip_view(pixels, grid).reshape((grid_z, grid_x * grid_y, pixels.shape[-1]))
+
+# Encode values or vectors into a strip image (grid_z, grid_x * grid_y, channels) with a single strided copy and in place remapping
+# Values are remapped into each colour channel (red only for a single channel), PNG vectors are remapped, and four channels add a constant alpha
+# The output buffer is reused when it matches, so repeated frames and objects with the same grid don't allocate or repeat any layout work
+def vf_strip_encode(array, grid, format, start, stop, channels=3, out=None, bottom_up=False):
+	grid_x, grid_y, grid_z = grid
+	if out is None or out.shape != (grid_z, grid_x * grid_y, channels):
+		out = np.empty((grid_z, grid_x * grid_y, channels), dtype=np.float32)
+		if channels == 4:
+			out[:, :, 3] = 1.0
+	
+	# Blender images start with the bottom row
+	source = vf_strip_view(array, grid)
+	if bottom_up:
+		source = source[::-1]
+	target = out.reshape((grid_z, grid_y, grid_x, channels))
+	
+	if array.ndim == 1:
+		# Values are always remapped and copied into each colour channel
+		value = target[..., :1]
+		np.copyto(value, source)
+		np.subtract(value, start, out=value)
+		np.divide(value, stop - start, out=value)
+		if channels > 1:
+			target[..., 1:min(channels, 3)] = value
+	else:
+		colour = target[..., :3]
+		np.copyto(colour, source)
+		if format == 'PNG':
+			np.subtract(colour, start, out=colour)
+			np.divide(colour, stop - start, out=colour)
+	return out
+
+# Write an 8-bit or 16-bit PNG directly from a top-down float image (0-1 range), streaming rows through zlib
+def vf_write_png(filepath, image, depth=8, rows_per_chunk=256):
+	height, width, channels = image.shape
+	colour_type = {1: 0, 2: 4, 3: 2, 4: 6}[channels] # Grey, grey alpha, RGB, RGBA
+	scale = float((1 << depth) - 1)
+	
+	def chunk(file, tag, data):
+		file.write(struct.pack('>I', len(data)))
+		file.write(tag)
+		file.write(data)
+		file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(tag)) & 0xffffffff))
+	
+	with open(filepath, 'wb') as file:
+		file.write(b'\x89PNG\r\n\x1a\n')
+		chunk(file, b'IHDR', struct.pack('>IIBBBBB', width, height, depth, colour_type, 0, 0, 0))
+		
+		compressor = zlib.compressobj(6)
+		rows = np.zeros((min(rows_per_chunk, height), 1 + width * channels * depth // 8), dtype=np.uint8) # Leading zero byte per row is the "none" filter
+		samples = np.empty((len(rows), width * channels), dtype='>u2') if depth == 16 else None # 16-bit samples are big-endian
+		for start in range(0, height, rows_per_chunk):
+			block = image[start:start + rows_per_chunk]
+			count = len(block)
+			# Match Blender's float to byte conversion (round half up, clamped)
+			if samples is None:
+				np.floor(np.clip(block.reshape((count, -1)), 0.0, 1.0) * scale + 0.5, out=rows[:count, 1:], casting='unsafe')
+			else:
+				np.floor(np.clip(block.reshape((count, -1)), 0.0, 1.0) * scale + 0.5, out=samples[:count], casting='unsafe')
+				rows[:count, 1:] = samples[:count].view(np.uint8)
+			data = compressor.compress(memoryview(rows[:count]).cast('B'))
+			if data:
+				chunk(file, b'IDAT', data)
+		chunk(file, b'IDAT', compressor.flush())
+		chunk(file, b'IEND', b'')
+
+# OpenEXR scanline encoding
+EXR_magic = 20000630
+EXR_compression = {'NONE': (0, 1), 'ZIP': (3, 16)} # Compression code and scanlines per block
+EXR_pixel_types = {'<f2': 1, '<f4': 2}
+
+def vf_exr_attribute(name, type_name, data):
+	return name.encode() + b'\x00' + type_name.encode() + b'\x00' + struct.pack('<i', len(data)) + data
+
+# Reorder and delta encode bytes ahead of zlib compression, as defined by the OpenEXR ZIP codec
+def vf_exr_zip(data):
+	raw = np.frombuffer(data, dtype=np.uint8)
+	half = (len(raw) + 1) // 2
+	reordered = np.empty_like(raw)
+	reordered[:half] = raw[0::2]
+	reordered[half:] = raw[1::2]
+	predicted = reordered.copy()
+	predicted[1:] = (reordered[1:].astype(np.int16) - reordered[:-1] + 384) & 0xff
+	return zlib.compress(memoryview(predicted))
+
+# Write a scanline OpenEXR file directly from a top-down float image
+# Channels are stored in alphabetical order (A, B, G, R) as required by the format
+def vf_write_exr(filepath, image, precision='<f4', compression='ZIP'):
+	height, width, channels = image.shape
+	names = ['R', 'G', 'B', 'A'][:channels]
+	order = sorted(range(channels), key=lambda i: names[i])
+	pixel_type = EXR_pixel_types[precision]
+	code, block_lines = EXR_compression[compression]
+	
+	channel_list = b''.join(names[i].encode() + b'\x00' + struct.pack('<iB3xii', pixel_type, 0, 1, 1) for i in order) + b'\x00'
+	header = struct.pack('<ii', EXR_magic, 2)
+	header += vf_exr_attribute('channels', 'chlist', channel_list)
+	header += vf_exr_attribute('compression', 'compression', struct.pack('<B', code))
+	header += vf_exr_attribute('dataWindow', 'box2i', struct.pack('<iiii', 0, 0, width - 1, height - 1))
+	header += vf_exr_attribute('displayWindow', 'box2i', struct.pack('<iiii', 0, 0, width - 1, height - 1))
+	header += vf_exr_attribute('lineOrder', 'lineOrder', struct.pack('<B', 0))
+	header += vf_exr_attribute('pixelAspectRatio', 'float', struct.pack('<f', 1.0))
+	header += vf_exr_attribute('screenWindowCenter', 'v2f', struct.pack('<ff', 0.0, 0.0))
+	header += vf_exr_attribute('screenWindowWidth', 'float', struct.pack('<f', 1.0))
+	header += b'\x00'
+	
+	blocks = (height + block_lines - 1) // block_lines
+	with open(filepath, 'wb') as file:
+		file.write(header)
+		table = file.tell()
+		offsets = np.zeros(blocks, dtype='<u8')
+		file.write(offsets.tobytes()) # Placeholder, patched once all block positions are known
+		
+		for block in range(blocks):
+			start = block * block_lines
+			# Scanlines store each channel contiguously: (lines, channels, width)
+			lines = np.ascontiguousarray(image[start:start + block_lines, :, order].transpose((0, 2, 1)), dtype=precision)
+			data = memoryview(lines).cast('B')
+			if code:
+				packed = vf_exr_zip(data)
+				if len(packed) < len(data):
+					data = packed
+			offsets[block] = file.tell()
+			file.write(struct.pack('<ii', start, len(data)))
+			file.write(data)
+		
+		file.seek(table)
+		file.write(offsets.tobytes())
+
+###########################################################################
+# Timeline sampling
+
+# Build the list of sample times within the scene range, including optional subframes
+def vf_sample_times(scene, step=1, subframes=1):
+	times = []
+	for frame in range(scene.frame_start, scene.frame_end + 1, step):
+		for subframe in range(subframes):
+			sample = frame + subframe / subframes
+			if sample <= scene.frame_end:
+				times.append(sample)
+	return times
+
+# Visit the timeline once, recording the world or local matrix of every object at every sample
+# Generator that yields (done, total) after each sample, so background deliveries stay responsive (run with vf_run_steps otherwise)
+# Returns the sample times and a preallocated (objects, samples, 4, 4) array
+def vf_sample_transforms(scene, objects, space='WORLD', step=1, subframes=1):
+	times = vf_sample_times(scene, step, subframes)
+	matrices = np.empty((len(objects), len(times), 4, 4), dtype=np.float32)
+	
+	# Save timeline position
+	frame_current = scene.frame_current
+	subframe_current = scene.frame_subframe
+	
+	try:
+		for i, sample in enumerate(times):
+			frame = math.floor(sample) # Rounds down for negative frames too, keeping the subframe within 0 to 1
+			scene.frame_set(frame, subframe = sample - frame)
+			for j, obj in enumerate(objects):
+				matrices[j, i] = obj.matrix_world if space == 'WORLD' else obj.matrix_local
+			yield i + 1, len(times)
+	finally:
+		# Reset timeline position, including when the delivery is cancelled part way through
+		scene.frame_set(frame_current, subframe = subframe_current)
+	return times, matrices
+
+# Decompose stacked (..., 4, 4) matrices into locations, rotation matrices, and scales in one pass, matching Matrix.decompose
+# Negative determinants are carried by the scale (the rotation is negated to stay a proper rotation)
+def vf_decompose(matrices):
+	matrices = np.asarray(matrices, dtype=np.float64)
+	location = matrices[..., :3, 3]
+	basis = matrices[..., :3, :3]
+	rotation = basis / np.linalg.norm(basis, axis=-2, keepdims=True)
+	negative = np.linalg.det(basis) < 0.0
+	rotation[negative] *= -1.0
+	scale = np.einsum('...ji,...ji->...i', rotation, basis)
+	return location, rotation, scale
+
+# Convert stacked rotation matrices into XYZ Euler angles (radians), choosing the smaller of the two equivalent solutions like Matrix.to_euler
+def vf_rotation_euler(rotation):
+	r = rotation
+	cy = np.hypot(r[..., 0, 0], r[..., 1, 0])
+	regular = cy > 16.0 * np.finfo(np.float32).eps
+	first = np.stack((
+		np.where(regular, np.arctan2(r[..., 2, 1], r[..., 2, 2]), np.arctan2(-r[..., 1, 2], r[..., 1, 1])),
+		np.arctan2(-r[..., 2, 0], cy),
+		np.where(regular, np.arctan2(r[..., 1, 0], r[..., 0, 0]), 0.0)), axis=-1)
+	second = np.stack((
+		np.arctan2(-r[..., 2, 1], -r[..., 2, 2]),
+		np.arctan2(-r[..., 2, 0], -cy),
+		np.arctan2(-r[..., 1, 0], -r[..., 0, 0])), axis=-1)
+	use_second = regular & (np.abs(second).sum(axis=-1) < np.abs(first).sum(axis=-1))
+	return np.where(use_second[..., np.newaxis], second, first)
+
+# Convert stacked rotation matrices into normalised (w, x, y, z) quaternions with w >= 0
+# Each quaternion is read from the row of its outer product (4 q q^T) with the largest diagonal, which keeps every sample numerically stable
+def vf_rotation_quaternion(rotation):
+	r = rotation
+	product = np.empty(r.shape[:-2] + (4, 4), dtype=np.float64)
+	product[..., 0, 0] = 1.0 + r[..., 0, 0] + r[..., 1, 1] + r[..., 2, 2]
+	product[..., 1, 1] = 1.0 + r[..., 0, 0] - r[..., 1, 1] - r[..., 2, 2]
+	product[..., 2, 2] = 1.0 - r[..., 0, 0] + r[..., 1, 1] - r[..., 2, 2]
+	product[..., 3, 3] = 1.0 - r[..., 0, 0] - r[..., 1, 1] + r[..., 2, 2]
+	product[..., 0, 1] = product[..., 1, 0] = r[..., 2, 1] - r[..., 1, 2]
+	product[..., 0, 2] = product[..., 2, 0] = r[..., 0, 2] - r[..., 2, 0]
+	product[..., 0, 3] = product[..., 3, 0] = r[..., 1, 0] - r[..., 0, 1]
+	product[..., 1, 2] = product[..., 2, 1] = r[..., 0, 1] + r[..., 1, 0]
+	product[..., 1, 3] = product[..., 3, 1] = r[..., 0, 2] + r[..., 2, 0]
+	product[..., 2, 3] = product[..., 3, 2] = r[..., 1, 2] + r[..., 2, 1]
+	best = np.argmax(np.diagonal(product, axis1=-2, axis2=-1), axis=-1)
+	quaternion = np.take_along_axis(product, best[..., np.newaxis, np.newaxis], axis=-2)[..., 0, :]
+	quaternion /= np.linalg.norm(quaternion, axis=-1, keepdims=True)
+	quaternion *= np.where(quaternion[..., :1] < 0.0, -1.0, 1.0)
+	return quaternion
+
+# Build the tracking columns for one object's sampled matrices (samples, 4, 4)
+# Returns the CSV header, the (samples, columns) table, and the same data as named columns for binary output
+def vf_transform_columns(times, matrices, rotation_mode='EULER', units='RAD'):
+	location, rotation, scale = vf_decompose(matrices)
+	if rotation_mode == 'QUATERNION':
+		rotation = vf_rotation_quaternion(rotation)
+		rotation_header = 'qw,qx,qy,qz'
+	else:
+		# Unwrap along the timeline so angles stay continuous through +/-180 degrees
+		rotation = np.unwrap(vf_rotation_euler(rotation), axis=0)
+		if units == 'DEG':
+			rotation = np.degrees(rotation)
+		rotation_header = 'rx,ry,rz'
+	frames = np.asarray(times, dtype=np.float64)
+	columns = {'frame': frames, 'location': location, 'rotation': rotation, 'scale': scale}
+	table = np.concatenate((frames[:, np.newaxis], location, rotation, scale), axis=1)
+	return 'frame,x,y,z,' + rotation_header + ',sx,sy,sz', table, columns
+
+###########################################################################
+# Point data encoding
+
+# Read evaluated vertex positions into an (points, 3) float32 array with a single bulk copy
+def vf_read_positions(obj):
+	mesh = obj.to_mesh()
+	positions = np.empty((len(mesh.vertices), 3), dtype=np.float32)
+	mesh.vertices.foreach_get('co', positions.ravel())
+	obj.to_mesh_clear()
+	return positions
+
+# Write a CSV file with a separate header row, formatting rows in fixed size chunks to keep memory use flat
+def vf_write_csv(filepath, header, array, rows_per_chunk=65536):
+	array = array.reshape((len(array), array.shape[-1] if array.ndim > 1 else 1)) # Explicit width, so empty arrays still reshape
+	row = ','.join(['%.9g'] * array.shape[1]) + '\n'
+	with open(filepath, 'w', newline='\n') as file:
+		file.write(header + '\n')
+		for start in range(0, len(array), rows_per_chunk):
+			chunk = array[start:start + rows_per_chunk]
+			file.write((row * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+# Write a binary little-endian PLY point cloud
+def vf_write_ply(filepath, positions):
+	header = 'ply\nformat binary_little_endian 1.0\nelement vertex ' + str(len(positions)) + '\nproperty float x\nproperty float y\nproperty float z\nend_header\n'
+	with open(filepath, 'wb') as file:
+		file.write(header.encode('ascii'))
+		np.ascontiguousarray(positions, dtype='<f4').tofile(file) # Also writes empty meshes, which memoryview casts reject
+
+# Write point positions in the selected format
+VF_point_extensions = {'CSV': '.csv', 'NPY': '.npy', 'PLY': '.ply', 'RAW': '.raw'}
+
+def vf_write_points(filepath, positions, point_format='CSV'):
+	if point_format == 'CSV':
+		vf_write_csv(filepath, "x,y,z", positions)
+	elif point_format == 'NPY':
+		np.save(filepath, positions.astype('<f4', copy=False), allow_pickle=False)
+	elif point_format == 'PLY':
+		vf_write_ply(filepath, positions)
+	else:
+		with open(filepath, 'wb') as file:
+			np.ascontiguousarray(positions, dtype='<f4').tofile(file)
+
+###########################################################################
+# STL encoding
+
+# Binary STL triangle record: facet normal, three vertices, and an unused attribute byte count (50 bytes, unpadded)
+VF_stl_record = np.dtype([('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')])
+
+# Read an object's evaluated triangles with bulk copies
+# Returns world space (vertices, 3) float32 positions and (triangles, 3) vertex indices, wound to face outwards even with negative scales
+# Export axes are Y forward and Z up, the same as Blender's own coordinate system, so no axis conversion is applied
+def vf_read_triangles(obj, depsgraph):
+	obj_eval = obj.evaluated_get(depsgraph)
+	mesh = obj_eval.to_mesh()
+	try:
+		mesh.calc_loop_triangles()
+		positions = np.empty((len(mesh.vertices), 3), dtype=np.float32)
+		mesh.vertices.foreach_get('co', positions.ravel())
+		triangles = np.empty((len(mesh.loop_triangles), 3), dtype=np.int32)
+		mesh.loop_triangles.foreach_get('vertices', triangles.ravel())
+	finally:
+		obj_eval.to_mesh_clear()
+	
+	matrix = np.array(obj_eval.matrix_world, dtype=np.float64)
+	positions = (positions @ matrix[:3, :3].T + matrix[:3, 3]).astype(np.float32)
+	if np.linalg.det(matrix[:3, :3]) < 0.0:
+		triangles = triangles[:, ::-1]
+	return positions, triangles
+
+# Write triangles to an open binary STL file as 50-byte records, building at most triangles_per_chunk records at a time
+# Facet normals are calculated from the triangle winding (degenerate triangles get a zero normal), returns the number of triangles written
+def vf_write_stl_triangles(file, positions, triangles, triangles_per_chunk=65536):
+	records = np.zeros(min(triangles_per_chunk, len(triangles)), dtype=VF_stl_record)
+	for start in range(0, len(triangles), triangles_per_chunk):
+		block = records[:len(triangles[start:start + triangles_per_chunk])]
+		corners = positions[triangles[start:start + triangles_per_chunk]]
+		normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+		lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+		np.divide(normals, lengths, out=normals, where=lengths > 0.0)
+		block['normal'] = normals
+		block['vertices'] = corners
+		file.write(block.view(np.uint8))
+	return len(triangles)
+
+# Write a single binary STL file containing the evaluated triangles of every listed object in world space
+# The triangle count is patched into the header once every object has been written, so only one mesh is held in memory at a time
+def vf_write_stl(filepath, objects, depsgraph):
+	with open(filepath, 'wb') as file:
+		file.write(b'Binary STL exported by VF Delivery'.ljust(80, b' '))
+		file.write(struct.pack('<I', 0))
+		count = 0
+		for obj in objects:
+			positions, triangles = vf_read_triangles(obj, depsgraph)
+			count += vf_write_stl_triangles(file, positions, triangles)
+		file.seek(80)
+		file.write(struct.pack('<I', count))
+
+###########################################################################
+# Mesh exporters
+
+# Export the current selection to a single file using the pipeline preset for the format
+# GLB files use the default Draco settings unless tuned settings are provided
+def vf_export_mesh(format, filepath, draco=None):
+	draco = draco or VF_draco_default
+	if format == "FBX":
+		bpy.ops.export_scene.fbx(
+			filepath = filepath,
+			check_existing = False, # Always overwrite existing files
+			use_selection = True,
+			use_visible = True,
+			use_active_collection = False, # This is now hardcoded, as we're converting collection selection into object selection manually above
 			
-			# Undo the previously completed object modifications
-			for i in range(undo_steps):
-				bpy.ops.ed.undo()
+			global_scale = 1.0, # 1.0
+			apply_unit_scale = True,
+			apply_scale_options = 'FBX_SCALE_NONE', # FBX_SCALE_NONE = All Local
+			use_space_transform = True,
+			axis_forward = '-Z',
+			axis_up = 'Y',
+			object_types = {'ARMATURE', 'CAMERA', 'EMPTY', 'LIGHT', 'MESH', 'OTHER'},
+			bake_space_transform = True, # True (this is "!experimental!")
+									
+			use_mesh_modifiers = True, # Come back to this...manually trigger application of mesh modifiers and convert attributes to UV maps
+			use_mesh_modifiers_render = True,
+			mesh_smooth_type = 'OFF', # OFF = Normals Only
+			use_subsurf = False, # Seems unhelpful for realtime (until realtime supports live subdivision cross-platform)
+			use_mesh_edges = False,
+			use_tspace = False,
+			use_triangles = True, # This wasn't included in the "perfect" Unity settings, but seems logical?
+			use_custom_props = False,
+									
+			use_armature_deform_only = True, # True
+			add_leaf_bones = False, # False
+			primary_bone_axis = 'X', # X Axis
+			secondary_bone_axis = 'Y', # Y Axis
+			armature_nodetype = 'NULL',
+									
+			bake_anim = True,
+			bake_anim_use_all_bones = True,
+			bake_anim_use_nla_strips = True,
+			bake_anim_use_all_actions = True,
+			bake_anim_force_startend_keying = True, # Some recommend False, but Unity may not load animations nicely without starting keyframes
+			bake_anim_step = 1.0,
+			bake_anim_simplify_factor = 1.0,
+									
+			path_mode = 'AUTO',
+			embed_textures = False,
+			batch_mode = 'OFF',
+			use_batch_own_dir = False,
+			use_metadata = True)
 		
-# MESH (3D PRINTING)
+	elif format == "GLB":
+		bpy.ops.export_scene.gltf(
+			filepath = filepath,
+			check_existing = False, # Always overwrite existing files
+			export_format = 'GLB',
+			export_copyright = '',
+			
+			export_image_format = 'JPEG',
+			export_texcoords = True,
+			export_normals = True,
+			export_draco_mesh_compression_enable = True,
+			export_draco_mesh_compression_level = draco['level'],
+			export_draco_position_quantization = draco['position'],
+			export_draco_normal_quantization = draco['normal'],
+			export_draco_texcoord_quantization = draco['texcoord'],
+			export_draco_color_quantization = 10,
+			export_draco_generic_quantization = 12,
+			
+			export_tangents = False,
+			export_materials = 'EXPORT',
+			export_colors = True,
+			use_mesh_edges = False,
+			use_mesh_vertices = False,
+			export_cameras = False,
+			
+			use_selection = True,
+			use_visible = True,
+			use_renderable = True,
+			use_active_collection = False, # This is hardcoded now, as collections are converted manually to object selections above
+			use_active_scene = False,
+			
+			export_extras = False,
+			export_yup = True,
+			export_apply = True,
+			
+			export_animations = True,
+			export_frame_range = True,
+			export_frame_step = 1,
+			export_force_sampling = True,
+			export_nla_strips = True,
+			export_def_bones = True, # Changed from default
+			export_optimize_animation_size = True, # Changed from default, may cause issues with stepped animations
+			export_current_frame = False,
+			export_skins = True,
+			export_all_influences = False,
+			
+			export_morph = True,
+			export_morph_normal = True,
+			export_morph_tangent = False,
+			
+			export_lights = False,
+			will_save_settings = False,
+			filter_glob = '*.glb;*.gltf')
+	
+	elif format == "OBJ":
 		
-		elif format == "STL":
-			batch = 'OFF' if combined else 'OBJECT'
-			output = location + file_name + file_format if combined else location
-			bpy.ops.export_mesh.stl(
-				filepath = output,
-				ascii = False,
-				check_existing = False, # Dangerous!
+		if bpy.app.version[0] < 4:
+			# Blender 3.x
+			bpy.ops.export_scene.obj(
+				filepath = filepath,
+				check_existing = False, # Always overwrite existing files
 				use_selection = True,
-				batch_mode = batch,
-				
-				global_scale = 1.0,
-				use_scene_unit = False,
+				use_animation = False,
 				use_mesh_modifiers = True,
-				
-				axis_forward = 'Y',
-				axis_up = 'Z',
-				filter_glob = '*.stl')
+				use_edges = False, # Changed from default
+				use_smooth_groups = False,
+				use_smooth_groups_bitflags = False,
+				use_normals = True,
+				use_uvs = True,
+				use_materials = True,
+				use_triangles = True, # Changed from default
+				use_nurbs = False,
+				use_vertex_groups = False,
+				use_blen_objects = True,
+				group_by_object = False,
+				group_by_material = False,
+				keep_vertex_order = True, # Changed from default
+				global_scale = 100.0,
+				path_mode = 'AUTO',
+				axis_forward = '-Z',
+				axis_up = 'Y')
 		
-# VOLUME (3D TEXTURE)
+		else:
+			# Blender 4.x
+			bpy.ops.wm.obj_export(
+				filepath = filepath,
+				check_existing = False, # Always overwrite existing files
+				export_animation = False,
+				#start_frame = bpy.context.scene.frame_start,
+				#end_frame = bpy.context.scene.frame_end,
+				forward_axis = 'NEGATIVE_Z',
+				up_axis = 'Y',
+				global_scale = 100.0,
+				apply_modifiers = True,
+				export_eval_mode = 'DAG_EVAL_RENDER', # Apply render modifiers, not viewport
+				export_selected_objects = True, # Export only selected object(s)
+				export_uv = True,
+				export_normals = True,
+				export_colors = False,
+				export_materials = True,
+				export_pbr_extensions = True, # Changed from default
+				path_mode = 'AUTO',
+				export_triangulated_mesh = True, # Changed from default
+				export_curves_as_nurbs = False,
+				export_object_groups = False,
+				export_material_groups = False,
+				export_vertex_groups = False,
+				export_smooth_groups = False,
+				smooth_group_bitflags = False)
+	
+	elif format == "USDZ":
+		bpy.ops.wm.usd_export(
+			filepath = filepath,
+			check_existing = False, # Changed from default
+			# Removed GUI options
+			selected_objects_only = True, # Changed from default
+			visible_objects_only = True,
+			export_animation = False, # May need to add an option for enabling animation exports depending on the project
+			export_hair = False,
+			export_uvmaps = True, # Need to test this: USD uses "st" as the default uv map name, and the exporter apparently doesn't convert Blender's default "UVmap" automatically?
+			export_normals = True,
+			export_materials = True,
+			use_instancing = False,
+			evaluation_mode = 'RENDER',
+			generate_preview_surface = True,
+			export_textures = True,
+			overwrite_textures = True, # Changed from default
+			relative_paths = True)
+
+# Lightweight snapshot of the selection, active object, and mode
+# Used instead of undo steps, which are slow in large scenes and may be disabled or limited
+class VFSelectionState:
+	def __init__(self, context):
+		self.view_layer = context.view_layer
+		self.selected = [obj for obj in context.view_layer.objects if obj.select_get()]
+		self.active = context.view_layer.objects.active
+		self.mode = self.active.mode if self.active is not None else None
+	
+	def restore(self):
+		for obj in self.view_layer.objects:
+			if obj.select_get():
+				obj.select_set(False)
+		for obj in self.selected:
+			try:
+				obj.select_set(True)
+			except (ReferenceError, RuntimeError):
+				pass # Removed or no longer in the view layer
+		self.view_layer.objects.active = self.active
+		if self.active is not None and self.active.mode != self.mode:
+			bpy.ops.object.mode_set(mode = self.mode)
+
+# Select only the listed objects
+def vf_select_only(objects):
+	for obj in bpy.context.selected_objects:
+		obj.select_set(False)
+	for obj in objects:
+		obj.select_set(True)
+
+# Export each object to an individually named file using background Blender processes
+# A temporary copy of the current file is split into shards of object names, one shard per worker
+# GLB files use the listed Draco settings, and workers tune any other objects when a tolerance is given
+# Objects listed in local are saved at the world origin, so shared geometry is exported in local space
+# Generator that yields (done, total) objects while polling the workers, so background deliveries stay responsive
+# Returns a dictionary of object names with None for success or an error message, and the Draco settings tuned by the workers
+def vf_export_parallel(format, location, names, workers, draco=None, tolerance=None, local=()):
+	file_format = "." + format.lower().split("-")[0]
+	directory = tempfile.mkdtemp(prefix='vf_delivery_')
+	results = {}
+	tuned = {}
+	processes = []
+	try:
+		snapshot = os.path.join(directory, 'snapshot.blend')
+		with vf_identity_transforms(list(local)):
+			bpy.ops.wm.save_as_mainfile(filepath=snapshot, copy=True, check_existing=False)
 		
-		elif format == "VF":
-			# Define the data to be saved
-			fourcc = "VF_V"  # Replace with the appropriate FourCC of either 'VF_F' for value or 'VF_V' for vec3
-			
-			# Name of the custom attribute
-			attribute_name = 'field_vector'
+		# Factory settings block Python drivers, so allow them in the workers whenever they run in this session
+		# Otherwise rigs with scripted drivers would export different geometry than the serial path
+		autoexec = ['--enable-autoexec'] if not bpy.app.autoexec_fail or bpy.context.preferences.filepaths.use_scripts_auto_execute else []
+		
+		# Start one worker per shard
+		for index in range(min(workers, len(names))):
+			job = os.path.join(directory, 'job_' + str(index) + '.json')
+			shard = names[index::workers]
+			with open(job, 'w') as file:
+				json.dump({'format': format, 'location': location, 'file_format': file_format, 'objects': shard, 'draco': {name: draco[name] for name in shard if name in draco} if draco else {}, 'tolerance': tolerance}, file)
+			command = [bpy.app.binary_path, '--background', '--factory-startup'] + autoexec + [snapshot, '--python', os.path.abspath(__file__), '--', '--worker', job]
+			processes.append((subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL), job, shard))
+		
+		# Collect per-object results as each worker exits
+		running = list(processes)
+		while running:
+			time.sleep(0.01)
+			for entry in list(running):
+				process, job, shard = entry
+				code = process.poll()
+				if code is None:
+					continue
+				running.remove(entry)
+				try:
+					with open(job + '.results') as file:
+						data = json.load(file)
+					results.update(data['results'])
+					tuned.update(data['draco'])
+				except (OSError, ValueError, KeyError):
+					for name in shard:
+						results[name] = 'worker exited with code ' + str(code)
+			yield len(names) - sum(len(shard) for process, job, shard in running), len(names)
+	finally:
+		# Stop any workers still running when the delivery is cancelled
+		for process, job, shard in processes:
+			if process.poll() is None:
+				process.terminate()
+				process.wait()
+		shutil.rmtree(directory, ignore_errors=True)
+	return results, tuned
+
+# Background worker entry point, exports each object listed in a job file
+def vf_export_worker(job_path):
+	with open(job_path) as file:
+		job = json.load(file)
+	
+	results = {}
+	tuned = {}
+	tolerance = job.get('tolerance')
+	depsgraph = bpy.context.evaluated_depsgraph_get() if tolerance is not None else None
+	for name in job['objects']:
+		obj = bpy.data.objects.get(name)
+		if obj is None:
+			results[name] = 'object not found'
+			continue
+		try:
+			vf_select_only([obj])
+			draco = job.get('draco', {}).get(name)
+			if draco is None and tolerance is not None:
+				draco = tuned[name] = vf_draco_tune([obj], depsgraph, tolerance)
+			vf_export_mesh(job['format'], job['location'] + name + job['file_format'], draco)
+			results[name] = None
+		except Exception as exc:
+			results[name] = str(exc)
+	
+	with open(job_path + '.results', 'w') as file:
+		json.dump({'results': results, 'draco': tuned}, file)
+
+###########################################################################
+# Linked duplicates
+
+# Convert a property value into something that can be compared and hashed (unsupported values never match)
+def vf_value_key(value):
+	if value is None or isinstance(value, (bool, int, float, str)):
+		return value
+	if isinstance(value, bpy.types.ID):
+		return value.name_full
+	try:
+		return tuple(vf_value_key(item) for item in value)
+	except TypeError:
+		return object()
+
+# Identify the local space geometry an object exports: its data block, every modifier setting (including geometry node inputs), and its materials
+def vf_instance_key(obj):
+	key = [obj.type, obj.data.name_full if obj.data is not None else obj.name]
+	for modifier in obj.modifiers:
+		key.append(modifier.type)
+		for prop in modifier.bl_rna.properties:
+			if prop.identifier not in ('rna_type', 'name') and not prop.is_readonly:
+				key.append((prop.identifier, vf_value_key(getattr(modifier, prop.identifier))))
+		for name in modifier.keys():
+			key.append((name, vf_value_key(modifier[name])))
+	key.append(tuple(slot.material.name_full if slot.material is not None else '' for slot in obj.material_slots))
+	return tuple(key)
+
+# Geometry node types whose output depends on where the modified object is placed
+VF_placement_nodes = {'GeometryNodeObjectInfo', 'GeometryNodeCollectionInfo', 'GeometryNodeSelfObject', 'GeometryNodeInputActiveCamera'}
+
+# Modifier settings that evaluate in world space or relative to another object
+VF_placement_settings = {'space': {'GLOBAL'}, 'texture_coords': {'GLOBAL', 'OBJECT'}}
+
+# Check if a geometry node tree (or any group nested in it) reads object placement or references other objects
+def vf_node_tree_placement(tree, visited):
+	visited.add(tree.name_full)
+	for node in tree.nodes:
+		if node.bl_idname in VF_placement_nodes:
+			return True
+		for socket in node.inputs:
+			if isinstance(getattr(socket, 'default_value', None), (bpy.types.Object, bpy.types.Collection)):
+				return True
+		group = getattr(node, 'node_tree', None)
+		if group is not None and group.name_full not in visited and vf_node_tree_placement(group, visited):
+			return True
+	return False
+
+# Check if an object's evaluated local geometry depends on its placement
+# Any modifier referencing another object or collection (Boolean operands, Mirror and Array offsets, Cast, Warp, hooks, and so on),
+# working in global or object space, or using geometry nodes that read object information, changes when the object is moved
+# Animation, drivers, and constraints (on the object or any parent) are also included, as FBX and glTF re-evaluate them while baking animation
+def vf_placement_dependent(obj):
+	parent = obj
+	while parent is not None:
+		if parent.animation_data is not None or len(parent.constraints):
+			return True
+		parent = parent.parent
+	for modifier in obj.modifiers:
+		for prop in modifier.bl_rna.properties:
+			if prop.identifier in ('rna_type', 'name'):
+				continue
+			value = getattr(modifier, prop.identifier)
+			if isinstance(value, (bpy.types.Object, bpy.types.Collection)):
+				return True
+			if value in VF_placement_settings.get(prop.identifier, ()):
+				return True
+		for name in modifier.keys():
+			if isinstance(modifier[name], (bpy.types.Object, bpy.types.Collection)):
+				return True
+		if modifier.type == 'NODES' and modifier.node_group is not None and vf_node_tree_placement(modifier.node_group, set()):
+			return True
+	return False
+
+# Group objects that share the same geometry, keeping the selection order (the first object of each group names the shared file)
+# Placement dependent objects are never grouped, and are returned by name so they can be exported in place
+def vf_instance_groups(objects):
+	groups = {}
+	in_place = set()
+	for obj in objects:
+		if vf_placement_dependent(obj):
+			in_place.add(obj.name)
+			groups[obj.name_full] = [obj]
+		else:
+			groups.setdefault(vf_instance_key(obj), []).append(obj)
+	return list(groups.values()), in_place
+
+# Temporarily place objects at the world origin so shared geometry is exported in local space
+# The transform properties are restored directly, so rotation values and modes are kept exactly
+@contextlib.contextmanager
+def vf_identity_transforms(objects):
+	if not objects:
+		yield
+		return
+	saved = [(obj.location.copy(), obj.rotation_euler.copy(), obj.rotation_quaternion.copy(), tuple(obj.rotation_axis_angle), obj.scale.copy()) for obj in objects]
+	try:
+		for obj in objects:
+			obj.matrix_world = mathutils.Matrix.Identity(4)
+		bpy.context.view_layer.update()
+		yield
+	finally:
+		for obj, (location, rotation_euler, rotation_quaternion, rotation_axis_angle, scale) in zip(objects, saved):
+			obj.location = location
+			obj.rotation_euler = rotation_euler
+			obj.rotation_quaternion = rotation_quaternion
+			obj.rotation_axis_angle = rotation_axis_angle
+			obj.scale = scale
+		bpy.context.view_layer.update()
+
+# Write the world placement of every object using each shared file to delivery_instances.json
+# Locations, w,x,y,z quaternion rotations, and scales are in Blender's Z-up coordinate system
+# Objects exported in place are already in world space, so they are listed with an identity placement
+def vf_write_instance_manifest(location, file_format, groups, in_place=()):
+	instances = {}
+	for objects in groups:
+		if objects[0].name in in_place:
+			instances[objects[0].name + file_format] = [{'name': objects[0].name, 'location': [0.0, 0.0, 0.0], 'rotation': [1.0, 0.0, 0.0, 0.0], 'scale': [1.0, 1.0, 1.0]}]
+			continue
+		translation, rotation, scale = vf_decompose([np.array(obj.matrix_world) for obj in objects])
+		rotation = vf_rotation_quaternion(rotation)
+		instances[objects[0].name + file_format] = [{
+			'name': obj.name,
+			'location': translation[i].tolist(),
+			'rotation': rotation[i].tolist(),
+			'scale': scale[i].tolist(),
+			} for i, obj in enumerate(objects)]
+	path = os.path.join(location, 'delivery_instances.json')
+	with open(path, 'w') as file:
+		json.dump(instances, file, separators=(',', ':'))
+	return path
+
+# Hard link a delivered file under another name (copying where links aren't supported), replacing any existing file
+def vf_link_file(source, target):
+	if os.path.lexists(target):
+		os.remove(target)
+	try:
+		os.link(source, target)
+	except OSError:
+		shutil.copyfile(source, target)
+
+###########################################################################
+# Incremental delivery
+
+# foreach_get key, component count, and buffer type for each attribute data type (string attributes are identified by name only)
+VF_attribute_keys = {
+	'FLOAT': ('value', 1, np.float32),
+	'INT': ('value', 1, np.int32),
+	'INT8': ('value', 1, np.int32),
+	'BOOLEAN': ('value', 1, np.bool_),
+	'FLOAT_VECTOR': ('vector', 3, np.float32),
+	'FLOAT2': ('vector', 2, np.float32),
+	'INT32_2D': ('value', 2, np.int32),
+	'FLOAT_COLOR': ('color', 4, np.float32),
+	'BYTE_COLOR': ('color', 4, np.float32),
+	'QUATERNION': ('value', 4, np.float32),
+	'FLOAT4X4': ('value', 16, np.float32),
+	}
+
+# Settings that change the contents of mesh exports
+VF_fingerprint_settings = ['file_type', 'file_grouping', 'instance_mode', 'use_draco_tune', 'draco_tolerance']
+
+# Add an image's contents to a fingerprint, as GLB and USDZ embed the image data
+# Packed images are hashed directly, unsaved or generated images by their pixels, and image files by their size and modification time
+def vf_fingerprint_image(digest, image):
+	digest.update((image.name + image.source + image.filepath).encode())
+	if image.packed_file is not None:
+		digest.update(image.packed_file.data)
+	elif image.is_dirty or image.source == 'GENERATED':
+		pixels = np.empty(len(image.pixels), dtype=np.float32)
+		image.pixels.foreach_get(pixels)
+		digest.update(pixels.tobytes())
+	else:
+		try:
+			stat = os.stat(bpy.path.abspath(image.filepath, library = image.library))
+			digest.update(repr((stat.st_size, stat.st_mtime_ns)).encode())
+		except OSError:
+			pass # Missing files are identified by path only
+
+# Add the inputs of a material's node tree to a fingerprint
+def vf_fingerprint_material(digest, material):
+	digest.update(material.name.encode())
+	if material.node_tree is None:
+		return
+	for node in material.node_tree.nodes:
+		digest.update((node.bl_idname + node.name).encode())
+		if getattr(node, 'image', None) is not None:
+			vf_fingerprint_image(digest, node.image)
+		for socket in node.inputs:
+			value = getattr(socket, 'default_value', None)
+			if value is None or socket.is_linked:
+				continue
+			if not isinstance(value, (bool, int, float, str)):
+				try:
+					value = tuple(value)
+				except TypeError:
+					continue
+			digest.update(repr(value).encode())
+	for link in material.node_tree.links:
+		digest.update((link.from_node.name + link.from_socket.identifier + link.to_node.name + link.to_socket.identifier).encode())
+
+# Fingerprint an object's evaluated geometry, transforms, modifier stack, materials, animation, and the relevant delivery settings
+def vf_fingerprint(obj, depsgraph, settings):
+	digest = hashlib.sha1()
+	digest.update(repr(bl_info['version']).encode())
+	for name in VF_fingerprint_settings:
+		digest.update(repr(getattr(settings, name)).encode())
+	
+	digest.update((obj.name + obj.type).encode())
+	digest.update(np.array(obj.matrix_world, dtype=np.float32).tobytes())
+	for modifier in obj.modifiers:
+		digest.update((modifier.name + modifier.type + str(modifier.show_render)).encode())
+	for slot in obj.material_slots:
+		if slot.material is not None:
+			vf_fingerprint_material(digest, slot.material)
+	if obj.animation_data and obj.animation_data.action:
+		for fcurve in obj.animation_data.action.fcurves:
+			points = np.empty(len(fcurve.keyframe_points) * 2, dtype=np.float32)
+			fcurve.keyframe_points.foreach_get('co', points)
+			digest.update((fcurve.data_path + str(fcurve.array_index)).encode())
+			digest.update(points.tobytes())
+	
+	# Evaluated geometry, after all modifiers
+	obj_eval = obj.evaluated_get(depsgraph)
+	try:
+		mesh = obj_eval.to_mesh()
+	except RuntimeError:
+		mesh = None
+	if mesh is not None:
+		positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+		mesh.vertices.foreach_get('co', positions)
+		loops = np.empty(len(mesh.loops), dtype=np.int32)
+		mesh.loops.foreach_get('vertex_index', loops)
+		totals = np.empty(len(mesh.polygons), dtype=np.int32)
+		mesh.polygons.foreach_get('loop_total', totals)
+		digest.update(positions.tobytes())
+		digest.update(loops.tobytes())
+		digest.update(totals.tobytes())
+		
+		# Every attribute value, including colours, material indices, and sharp face or edge flags
+		for attribute in mesh.attributes:
+			digest.update((attribute.name + attribute.domain + attribute.data_type).encode())
+			if attribute.data_type in VF_attribute_keys:
+				key, width, dtype = VF_attribute_keys[attribute.data_type]
+				values = np.empty(len(attribute.data) * width, dtype=dtype)
+				attribute.data.foreach_get(key, values)
+				digest.update(values.tobytes())
+		for uv_layer in mesh.uv_layers:
+			uvs = np.empty(len(uv_layer.data) * 2, dtype=np.float32)
+			uv_layer.data.foreach_get('uv', uvs)
+			digest.update(uvs.tobytes())
+		
+		# Smooth shading and material assignments (stored outside the generic attributes before Blender 4.0)
+		smooth = np.empty(len(mesh.polygons), dtype=np.bool_)
+		mesh.polygons.foreach_get('use_smooth', smooth)
+		materials = np.empty(len(mesh.polygons), dtype=np.int32)
+		mesh.polygons.foreach_get('material_index', materials)
+		digest.update(smooth.tobytes())
+		digest.update(materials.tobytes())
+		
+		# Custom normals (corner normals are always available from Blender 4.1, earlier versions calculate split normals)
+		if hasattr(mesh, 'corner_normals'):
+			normals = np.empty(len(mesh.corner_normals) * 3, dtype=np.float32)
+			mesh.corner_normals.foreach_get('vector', normals)
+			digest.update(normals.tobytes())
+		elif mesh.has_custom_normals:
+			mesh.calc_normals_split()
+			normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+			mesh.loops.foreach_get('normal', normals)
+			digest.update(normals.tobytes())
+		obj_eval.to_mesh_clear()
+	return digest.hexdigest()
+
+# Fingerprint a group of objects exported to the same file
+def vf_fingerprint_group(objects, depsgraph, settings):
+	digest = hashlib.sha1()
+	for obj in sorted(objects, key=lambda obj: obj.name):
+		digest.update(vf_fingerprint(obj, depsgraph, settings).encode())
+	return digest.hexdigest()
+
+# Manifest of output file fingerprints stored in the delivery folder
+class VFDeliveryManifest:
+	filename = '.vf_delivery_manifest.json'
+	
+	def __init__(self, location):
+		self.location = location
+		self.files = {}
+		try:
+			with open(os.path.join(location, self.filename)) as file:
+				self.files = json.load(file).get('files', {})
+		except (OSError, ValueError):
+			pass
+	
+	# Check if an output file exists and was created from identical inputs
+	def is_current(self, filename, fingerprint):
+		return self.files.get(filename) == fingerprint and os.path.exists(os.path.join(self.location, filename))
+	
+	def update(self, filename, fingerprint):
+		self.files[filename] = fingerprint
+	
+	def save(self):
+		with open(os.path.join(self.location, self.filename), 'w') as file:
+			json.dump({'version': list(bl_info['version']), 'files': self.files}, file, indent = '\t', sort_keys = True)
+
+###########################################################################
+# Draco tuning
+
+# Draco settings used for GLB files unless tuning picks others
+VF_draco_default = {'level': 6, 'position': 14, 'normal': 10, 'texcoord': 12}
+
+# Compression levels tried when tuning (ties keep the lower, faster decoding level)
+VF_draco_levels = (4, 7, 10)
+
+# Fewest position quantization bits that keep every vertex within the tolerance (in world units) of the uncompressed mesh
+# Draco snaps positions to a cubic grid spanning the largest bounding box extent, which is simulated here on the evaluated geometry
+# The exporter quantizes each material primitive separately within its own (smaller) bounds, so this is a conservative estimate
+def vf_draco_position_bits(objects, depsgraph, tolerance):
+	bits = 8
+	for obj in objects:
+		obj_eval = obj.evaluated_get(depsgraph)
+		try:
+			mesh = obj_eval.to_mesh()
+		except RuntimeError:
+			continue
+		if mesh is None:
+			continue
+		positions = np.empty((len(mesh.vertices), 3), dtype=np.float32)
+		mesh.vertices.foreach_get('co', positions.ravel())
+		obj_eval.to_mesh_clear()
+		if not len(positions):
+			continue
+		
+		positions = positions.astype(np.float64)
+		linear = np.array(obj_eval.matrix_world, dtype=np.float64)[:3, :3]
+		low = positions.min(axis=0)
+		extent = (positions.max(axis=0) - low).max()
+		if extent == 0.0:
+			continue
+		for bits in range(bits, 31):
+			steps = (1 << bits) - 1
+			quantized = np.floor((positions - low) * (steps / extent) + 0.5) * (extent / steps) + low
+			if np.sqrt((((quantized - positions) @ linear.T) ** 2).sum(axis=1).max()) <= tolerance:
+				break
+	return bits
+
+# Pick Draco settings for the current selection: the coarsest position quantization within the tolerance, then the compression level giving the smallest file
+# Normal and texture coordinate quantization keep their defaults, as the tolerance only covers geometric error
+def vf_draco_tune(objects, depsgraph, tolerance):
+	draco = dict(VF_draco_default, position=vf_draco_position_bits(objects, depsgraph, tolerance))
+	directory = tempfile.mkdtemp(prefix='vf_draco_')
+	try:
+		sizes = {}
+		for level in VF_draco_levels:
+			filepath = os.path.join(directory, str(level) + '.glb')
+			vf_export_mesh('GLB', filepath, dict(draco, level=level))
+			sizes[level] = os.path.getsize(filepath)
+		draco['level'] = min(sizes, key=sizes.get)
+	finally:
+		shutil.rmtree(directory, ignore_errors=True)
+	return draco
+
+# Tuned Draco settings for each output file and the fingerprint they were tuned for, stored in the delivery folder so later deliveries don't search again
+# Fingerprints include the tolerance, so changing it searches again, and files not in the current delivery keep their entries
+class VFDracoCache:
+	filename = '.vf_draco_cache.json'
+	
+	def __init__(self, location):
+		self.location = location
+		self.assets = {}
+		try:
+			with open(os.path.join(location, self.filename)) as file:
+				self.assets = json.load(file).get('assets', {})
+		except (OSError, ValueError):
+			pass
+	
+	# Return the cached settings for an output file, or None if it hasn't been tuned with the same inputs
+	def get(self, filename, fingerprint):
+		entry = self.assets.get(filename)
+		if not isinstance(entry, dict) or entry.get('fingerprint') != fingerprint or set(entry.get('draco') or {}) != set(VF_draco_default):
+			return None
+		return entry['draco']
+	
+	# Replace the entry for an output file, so edits don't leave superseded fingerprints behind
+	def update(self, filename, fingerprint, draco):
+		self.assets[filename] = {'fingerprint': fingerprint, 'draco': draco}
+	
+	# Return cached settings, or tune the current selection and cache the result
+	def settings(self, filename, fingerprint, objects, depsgraph, tolerance):
+		draco = self.get(filename, fingerprint)
+		if draco is None:
+			draco = vf_draco_tune(objects, depsgraph, tolerance)
+			self.update(filename, fingerprint, draco)
+		return draco
+	
+	def save(self):
+		with open(os.path.join(self.location, self.filename), 'w') as file:
+			json.dump({'version': list(bl_info['version']), 'assets': self.assets}, file, indent = '\t', sort_keys = True)
+
+###########################################################################
+# Delivery instrumentation
+
+# Recordings currently using tracemalloc, and whether tracing was started here (tracing started elsewhere is left running)
+VF_tracemalloc = {'users': 0, 'started': False}
+
+def vf_tracemalloc_acquire():
+	if VF_tracemalloc['users'] == 0:
+		VF_tracemalloc['started'] = not tracemalloc.is_tracing()
+		if VF_tracemalloc['started']:
+			tracemalloc.start()
+	VF_tracemalloc['users'] += 1
+
+# Tracing stops only when the last recording finishes, so queued and watch deliveries keep measuring memory
+def vf_tracemalloc_release():
+	VF_tracemalloc['users'] -= 1
+	if VF_tracemalloc['users'] == 0 and VF_tracemalloc['started']:
+		tracemalloc.stop()
+		VF_tracemalloc['started'] = False
+
+# Records wall time and peak Python memory (including NumPy buffers) for each stage of a delivery, along with output file sizes
+# When disabled, stages are passed through without any measurement
+# Memory tracing starts with the first stage rather than when a queued job is created, and noticeably slows Python exporters (glTF and FBX)
+class VFDeliveryStats:
+	filename = 'delivery_report.json'
+	
+	def __init__(self, enabled=True):
+		self.enabled = enabled
+		self.stages = []
+		self.files = []
+		self.start = time.perf_counter()
+		self.seconds = 0.0
+		self.tracing = False
+	
+	@contextlib.contextmanager
+	def stage(self, name, obj=None):
+		if not self.enabled:
+			yield
+			return
+		if not self.tracing:
+			vf_tracemalloc_acquire()
+			self.tracing = True
+		tracemalloc.reset_peak()
+		start = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.stages.append({
+				'stage': name,
+				'object': obj,
+				'seconds': time.perf_counter() - start,
+				'peak_bytes': tracemalloc.get_traced_memory()[1],
+				})
+	
+	def add_file(self, filepath):
+		if self.enabled and os.path.isfile(filepath):
+			self.files.append({'file': os.path.basename(filepath), 'bytes': os.path.getsize(filepath)})
+	
+	def finish(self):
+		self.seconds = time.perf_counter() - self.start
+		if self.tracing:
+			vf_tracemalloc_release()
+			self.tracing = False
+	
+	def summary(self):
+		total = sum(file['bytes'] for file in self.files)
+		text = str(len(self.files)) + (" file, " if len(self.files) == 1 else " files, ") + vf_format_bytes(total) + " in " + format(self.seconds, '.2f') + "s"
+		if self.stages:
+			slowest = max(self.stages, key=lambda stage: stage['seconds'])
+			text += " (slowest: " + slowest['stage'] + (" " + slowest['object'] if slowest['object'] else "") + " " + format(slowest['seconds'], '.2f') + "s)"
+		return text
+	
+	def write(self, location, settings):
+		data = {
+			'version': list(bl_info['version']),
+			'blender': bpy.app.version_string,
+			'file': bpy.data.filepath,
+			'format': settings.file_type,
+			'grouping': settings.file_grouping,
+			'seconds': self.seconds,
+			'stages': self.stages,
+			'files': self.files,
+			'bytes': sum(file['bytes'] for file in self.files),
+			'note': 'Peak memory is measured with tracemalloc, which noticeably slows Python exporters (glTF and FBX), so these stage timings are not comparable with deliveries made without Report',
+			}
+		try:
+			import resource
+			data['process_peak_rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		except ImportError:
+			pass # Not available on Windows
+		with open(os.path.join(location, self.filename), 'w') as file:
+			json.dump(data, file, indent = '\t')
+
+# Format a byte count for display
+def vf_format_bytes(size):
+	for unit in ('B', 'KB', 'MB', 'GB'):
+		if size < 1024 or unit == 'GB':
+			return (str(size) if unit == 'B' else format(size, '.1f')) + " " + unit
+		size /= 1024
+
+###########################################################################
+# Main class
+
+# Deliver the listed objects using the scene's delivery settings
+# Exporters work on the selection, so the objects must already be selected (and the volume object active)
+# Messages are passed to report using the same arguments as Operator.report, and stage timings are recorded in stats
+def vf_deliver(context, objects, file_name, report, stats=None):
+	return vf_run_steps(vf_deliver_steps(context, objects, file_name, report, stats))
+
+# Run delivery steps to completion, returning the delivery result
+def vf_run_steps(steps):
+	while True:
+		try:
+			next(steps)
+		except StopIteration as stop:
+			return stop.value
+
+# Generator version of vf_deliver that yields (done, total) after each object or frame, so delivery can be spread across timer ticks
+# Closing the generator stops the delivery between files, leaving everything already written intact
+def vf_deliver_steps(context, objects, file_name, report, stats=None):
+	# Set up local variables
+	stats = stats or VFDeliveryStats(False)
+	location = bpy.path.abspath(bpy.context.scene.vf_delivery_settings.file_location)
+	format = bpy.context.scene.vf_delivery_settings.file_type
+	file_format = "." + format.lower().split("-")[0] # Get only the characters before a dash to support multiple variations of a single format
+	combined = True if bpy.context.scene.vf_delivery_settings.file_grouping == "COMBINED" else False
+	
+	# Create directory if it doesn't exist yet
+	if not os.path.exists(location):
+		os.makedirs(location)
+	
+# MESH (REALTIME 3D)
+	
+	if format == "FBX" or format == "GLB" or format == "OBJ" or format == "USDZ":
+		# Fingerprint inputs and skip unchanged outputs when enabled
+		settings = bpy.context.scene.vf_delivery_settings
+		manifest = VFDeliveryManifest(location) if settings.use_incremental else None
+		cache = VFDracoCache(location) if format == "GLB" and settings.use_draco_tune else None
+		with stats.stage('depsgraph'):
+			depsgraph = bpy.context.evaluated_depsgraph_get()
+		skipped = 0
+		
+		if combined:
+			# Export all selected objects to the same file
+			with stats.stage('fingerprint'):
+				fingerprint = vf_fingerprint_group(objects, depsgraph, settings) if manifest or cache else None
+			if manifest and manifest.is_current(file_name + file_format, fingerprint):
+				skipped += 1
+			else:
+				draco = None
+				if cache:
+					with stats.stage('draco', file_name):
+						draco = cache.settings(file_name + file_format, fingerprint, objects, depsgraph, settings.draco_tolerance)
+				with stats.stage('export', file_name):
+					vf_export_mesh(format, location + file_name + file_format, draco)
+				stats.add_file(location + file_name + file_format)
+				if manifest:
+					manifest.update(file_name + file_format, fingerprint)
+		
+		else:
+			# Group linked duplicates so each unique geometry is exported once (in local space) using the first object's name
+			# Objects whose geometry depends on their placement are exported in place instead
+			instancing = settings.instance_mode != 'OFF'
+			in_place = set()
+			if instancing:
+				with stats.stage('instances'):
+					groups, in_place = vf_instance_groups(objects)
+			else:
+				groups = [[obj] for obj in objects]
+			local = [obj for obj in [group[0] for group in groups] if instancing and obj.name not in in_place]
 			
-			# Get the active selected object
-			obj = bpy.context.object
+			# Filter out objects that haven't changed since the last delivery
+			pending = []
+			fingerprints = {}
+			for obj in [group[0] for group in groups]:
+				if manifest or cache:
+					with stats.stage('fingerprint', obj.name):
+						fingerprints[obj.name] = vf_fingerprint(obj, depsgraph, settings)
+				if manifest and manifest.is_current(obj.name + file_format, fingerprints[obj.name]):
+					skipped += 1
+					continue
+				pending.append(obj)
 			
-			# Ensure the selected object is a mesh with equal to or fewer than 65536 vertices and the necessary properties and attributes
-			if obj and obj.type == 'MESH' and len(obj.data.vertices) <= 65536 and obj.data.get('vf_point_grid_x') is not None and obj.data.get('vf_point_grid_y') is not None and obj.data.get('vf_point_grid_z') is not None:
-				# Get evaluated object
-				obj = bpy.context.evaluated_depsgraph_get().objects.get(obj.name)
+			if settings.use_parallel and len(pending) > 1:
+				# Cached Draco settings are passed to the workers, which tune any other objects themselves
+				draco = {}
+				if cache:
+					for obj in pending:
+						cached = cache.get(obj.name + file_format, fingerprints[obj.name])
+						if cached is not None:
+							draco[obj.name] = cached
 				
-				# Check if named attribute exists
-				if attribute_name in obj.data.attributes:
-					# Create empty array
-					array = []
-					
-					# For each attribute entry, collect the results
-					for data in obj.data.attributes[attribute_name].data:
-						# Check if the attribute includes a value
-						if hasattr(data, 'value'):
-							array.append(data.value)
-						# Check if the attribute includes a vector
-						elif hasattr(data, 'vector'):
-							# Swizzle XZY order for Blender to Unity coordinate conversion
-							array.append((data.vector.x, data.vector.z, data.vector.y))
-						else:
-							print(f"Values not found in '{attribute_name}' attribute.")
-							return {'CANCELLED'}
-					
-					# Set array size using custom properties
-					size_x = obj.data["vf_point_grid_x"]
-					size_y = obj.data["vf_point_grid_z"] # Swizzle XZY order for Unity coordinate system
-					size_z = obj.data["vf_point_grid_y"] # Swizzle XZY order for Unity coordinate system
-					
-					# Calculate the stride based on the data type
-					is_float_data = fourcc[3] == 'F'
-					stride = 1 if is_float_data else 3
-					
-					# Create a new binary file for writing
-					with open(location + obj.name + file_format, 'wb') as file:
-						# Write the FourCC
-						file.write(struct.pack('4s', fourcc.encode('utf-8')))
-						
-						# Write the volume size
-						file.write(struct.pack('HHH', size_x, size_y, size_z))
-						
-						# Write the data
-						for value in array:
-							if is_float_data:
-								file.write(struct.pack('f', value))
-							else:
-								file.write(struct.pack('fff', *value))
+				# Export each object in background Blender processes
+				with stats.stage('export parallel'):
+					results, tuned = yield from vf_export_parallel(format, location, [obj.name for obj in pending], settings.parallel_workers, draco, settings.draco_tolerance if cache else None, [obj for obj in pending if obj in local])
+				for name, values in tuned.items():
+					cache.update(name + file_format, fingerprints[name], values)
+				failed = [name for name, error in results.items() if error is not None]
+				for name in failed:
+					print(f"Export of '{name}' failed: {results[name]}")
+				if failed:
+					report({'WARNING'}, str(len(failed)) + " of " + str(len(results)) + " objects failed to export, see the system console for details")
 				else:
-					print(f"Selected object does not contain '{attribute_name}' values.")
-					return {'CANCELLED'}
-				
+					report({'INFO'}, str(len(results)) + " objects exported")
+				exported = [name for name, error in results.items() if error is None]
+				for name in exported:
+					stats.add_file(location + name + file_format)
+			
 			else:
-				print(f"Selected object is not a mesh")
+				# Loop through each of the selected objects
+				exported = []
+				for index, obj in enumerate(pending):
+					with stats.stage('selection', obj.name):
+						vf_select_only([obj])
+					with vf_identity_transforms([obj] if obj in local else []):
+						draco = None
+						if cache:
+							with stats.stage('draco', obj.name):
+								draco = cache.settings(obj.name + file_format, fingerprints[obj.name], [obj], depsgraph, settings.draco_tolerance)
+						with stats.stage('export', obj.name):
+							vf_export_mesh(format, location + obj.name + file_format, draco)
+					stats.add_file(location + obj.name + file_format)
+					exported.append(obj.name)
+					yield index + 1, len(pending)
+			
+			if manifest:
+				for name in exported:
+					manifest.update(name + file_format, fingerprints[name])
+			
+			if instancing:
+				# List every placement of each shared file
+				with stats.stage('instances'):
+					stats.add_file(vf_write_instance_manifest(location, file_format, groups, in_place))
+				
+				# Optionally give every object its own file name for consumers that expect one file per object
+				if settings.instance_mode == 'LINK':
+					for group in groups:
+						source = location + group[0].name + file_format
+						if not os.path.exists(source):
+							continue
+						for obj in group[1:]:
+							vf_link_file(source, location + obj.name + file_format)
 				
-				# Cancel processing
+				instances = len(objects) - len(groups)
+				if instances:
+					report({'INFO'}, str(instances) + " linked " + ("duplicate" if instances == 1 else "duplicates") + " delivered from " + str(len(groups)) + " shared " + ("file" if len(groups) == 1 else "files"))
+		
+		if cache:
+			cache.save()
+		
+		if manifest:
+			manifest.save()
+			if skipped:
+				report({'INFO'}, str(skipped) + " unchanged " + ("file" if skipped == 1 else "files") + " skipped")
+	
+# MESH (3D PRINTING)
+	
+	elif format == "STL":
+		# Encode triangles directly from the evaluated meshes instead of using the STL exporter operator
+		with stats.stage('depsgraph'):
+			depsgraph = bpy.context.evaluated_depsgraph_get()
+		if combined:
+			with stats.stage('export', file_name):
+				vf_write_stl(location + file_name + file_format, objects, depsgraph)
+			stats.add_file(location + file_name + file_format)
+		else:
+			for index, obj in enumerate(objects):
+				with stats.stage('export', obj.name):
+					vf_write_stl(location + obj.name + file_format, [obj], depsgraph)
+				stats.add_file(location + obj.name + file_format)
+				yield index + 1, len(objects)
+	
+# VOLUME (3D TEXTURE)
+	
+	elif format == "VF" or format == "PNG" or format == "EXR":
+		# Get the validated and evaluated volume object
+		# The actual limit for 3D textures in Unity is 2048 x 2048 x 2048 = 8,589,934,592
+		# However...that would result in an image over 4 million pixels wide, and I just don't want to deal with the ramifications of that right now
+		with stats.stage('depsgraph'):
+			obj, grid = vf_volume_object(bpy.context)
+		if obj is None:
+			# Cancel processing
+			return {'CANCELLED'}
+		
+		settings = context.scene.vf_delivery_settings
+		scene = context.scene
+		name = obj.name
+		
+		# Set array size using custom properties
+		size = (grid[0], grid[2], grid[1]) # Swizzle XZY order for Unity coordinate system
+		
+		# The original format stores each dimension as a uint16
+		if format == 'VF' and settings.vf_version == 'V1' and settings.volume_sequence != 'CONTAINER' and max(size) > 65535:
+			report({'ERROR'}, "Volume dimensions exceed the 65535 limit of the original VF format, use VF version 2 instead")
+			return {'CANCELLED'}
+		
+		# Check downsample factors before writing anything
+		if settings.volume_mips == 'FACTORS':
+			invalid = vf_mip_factors(settings.volume_mip_factors)[1]
+			if invalid:
+				report({'ERROR'}, "Invalid downsample " + ("factor" if len(invalid) == 1 else "factors") + " " + ", ".join(invalid) + " (use numbers greater than 1 separated by commas)")
 				return {'CANCELLED'}
 		
-		elif format == "PNG" or format == "EXR":
-			# Name of the custom attribute
-			attribute_name = 'field_vector'
-			
-			# Get the active selected object
-			obj = bpy.context.object
-			
-			# Ensure the selected object is a mesh with equal to or fewer than 65536 vertices and the necessary properties and attributes
-			# The actual limit for 3D textures in Unity is 2048 x 2048 x 2048 = 8,589,934,592
-			# However...that would result in an image over 4 million pixels wide, and I just don't want to deal with the ramifications of that right now
-			if obj and obj.type == 'MESH' and len(obj.data.vertices) <= 65536 and obj.data.get('vf_point_grid_x') is not None and obj.data.get('vf_point_grid_y') is not None and obj.data.get('vf_point_grid_z') is not None:
-				# Get evaluated object
-				obj = bpy.context.evaluated_depsgraph_get().objects.get(obj.name)
+		# Frames to export (None keeps the current frame and the unnumbered file name)
+		sequence = settings.volume_sequence
+		if sequence == 'FRAME':
+			frames = [None]
+		else:
+			frames = range(scene.frame_start, scene.frame_end + 1)
+		frame_current = scene.frame_current
+		
+		# Downsampled levels to export next to the base file
+		levels = [('', grid)] + vf_volume_levels(grid, settings.volume_mips, settings.volume_mip_factors)
+		
+		# Buffers are reused from frame to frame so memory stays flat across the sequence
+		array = None
+		pixels = {}
+		writers = {}
+		try:
+			for index, frame in enumerate(frames):
+				if frame is not None:
+					# Step the timeline once and get the newly evaluated object
+					with stats.stage('depsgraph', name):
+						scene.frame_set(frame)
+						obj = context.evaluated_depsgraph_get().objects.get(name)
+				
+				# Read the named attribute
+				with stats.stage('read', name):
+					array = vf_read_attribute(obj, VF_volume_attribute, grid, array)
+				if array is None:
+					return {'CANCELLED'}
 				
-				# Check if named attribute exists
-				if attribute_name in obj.data.attributes:
-					# Get remapping values
-					start = context.scene.vf_delivery_settings.data_range[0]
-					stop = context.scene.vf_delivery_settings.data_range[1]
+				# Write the base grid followed by each downsampled level, each level reduced from the one before it
+				level_array = array
+				level_grid = grid
+				for suffix, target in levels:
+					if target != level_grid:
+						with stats.stage('downsample', name):
+							level_array = vf_downsample(level_array, level_grid, target, settings.volume_mip_filter)
+						level_grid = target
+					level_size = (level_grid[0], level_grid[2], level_grid[1]) # Swizzle XZY order for Unity coordinate system
 					
-					# Create empty array
-					array = []
+					# Numbered files use Blender's four digit frame padding (PNG and EXR containers also fall back to numbered files)
+					filepath = location + name + ('' if frame is None else '_' + str(frame).zfill(4)) + suffix + file_format
 					
-					# For each attribute entry, collect the results
-					for data in obj.data.attributes[attribute_name].data:
-						# Check if the attribute includes a value
-						if hasattr(data, 'value'):
-							# Instead of nested arrays, just create a flat list of values
-							val = self.remap(data.value, start, stop)
-							array.append(val)
-							array.append(val)
-							array.append(val)
-							array.append(1.0)
-						# Check if the attribute includes a vector
-						elif hasattr(data, 'vector'):
-							# Instead of nested arrays, just create a flat list of values
-							if format == 'PNG':
-								array.append(self.remap(data.vector.x, start, stop))
-								# Swizzle ZY order for Blender to Unity coordinate conversion
-								array.append(self.remap(data.vector.z, start, stop))
-								array.append(self.remap(data.vector.y, start, stop))
-							else:
-								array.append(data.vector.x)
-								# Swizzle ZY order for Blender to Unity coordinate conversion
-								array.append(data.vector.z)
-								array.append(data.vector.y)
-							array.append(1.0)
+					if format == 'VF':
+						if sequence == 'CONTAINER':
+							# Stream every frame into a single version 2 container per level, the frame count is written on close
+							if suffix not in writers:
+								filepath = location + name + suffix + file_format
+								writers[suffix] = VFVolumeFieldWriter(filepath, level_size, 1 if level_array.ndim == 1 else 3, settings.vf_precision, settings.vf_compression, int(settings.vf_bricks))
+							with stats.stage('write', name):
+								writers[suffix].write_frame(level_array)
+						elif settings.vf_version == 'V2':
+							# Write the versioned container with 32-bit dimensions, selected precision, optional sparse bricks, and optional compression
+							with stats.stage('write', name):
+								vf_write_volume_field_v2(filepath, level_array, level_size, settings.vf_precision, settings.vf_compression, int(settings.vf_bricks))
 						else:
-							print(f"Values not found in '{attribute_name}' attribute.")
-							return {'CANCELLED'}
-					
-					# Get output sizes using custom properties
-					grid_x = obj.data["vf_point_grid_x"]
-					grid_y = obj.data["vf_point_grid_y"]
-					grid_z = obj.data["vf_point_grid_z"]
-					
-					# Set image width (horizontal * depth) and height (vertical)
-					# Swizzle ZY order for Unity coordinate system
-					image_width = grid_x * grid_y
-					image_height = grid_z
+							# Write the FourCC ('VF_F' for value or 'VF_V' for vec3), volume size, and data
+							with stats.stage('write', name):
+								vf_write_volume_field(filepath, level_array, level_size)
 					
-					# Create image
-					image = bpy.data.images.new("3DtextureOutput", width=image_width, height=image_height, alpha=False, float_buffer=True, is_data=True)
-					
-					# Image content
-					# Swizzle ZY order for Unity coordinate system
-					array = np.array(array).reshape((grid_y, grid_z, grid_x, 4))
-					# Flip vertical axis
-					array = array[:,::-1,:]
-					# Rotate
-					array = np.rot90(array, axes=(0, 1))
-					# Flatten into string of colour values
-					image.pixels = array.flatten()
-					
-					# Save image
-					image.filepath_raw = location + obj.name + file_format
-					if format == 'PNG':
-						image.file_format = 'PNG'
 					else:
-						image.file_format = 'OPEN_EXR'
-					image.save()
-				else:
-					print(f"Selected object does not contain '{attribute_name}' values.")
-					return {'CANCELLED'}
+						if settings.strip_encoder == 'DIRECT':
+							# Arrange into an RGB image strip, or a single red channel for compact values (without Blender's constant alpha channel)
+							channels = 1 if settings.strip_channels == 'COMPACT' and level_array.ndim == 1 else 3
+							with stats.stage('encode', name):
+								image = pixels[suffix] = vf_strip_encode(level_array, level_grid, format, settings.data_range[0], settings.data_range[1], channels, pixels.get(suffix))
+							
+							# Write the file directly without creating an image datablock
+							with stats.stage('write', name):
+								if format == 'PNG':
+									vf_write_png(filepath, image, int(settings.png_depth))
+								else:
+									vf_write_exr(filepath, image, VF2_precision[settings.exr_precision])
+						
+						else:
+							# Arrange into a bottom-up RGBA image strip with a constant alpha channel
+							with stats.stage('encode', name):
+								pixels[suffix] = vf_strip_encode(level_array, level_grid, format, settings.data_range[0], settings.data_range[1], 4, pixels.get(suffix), bottom_up=True)
+							
+							# Set image width (horizontal * depth) and height (vertical)
+							# Swizzle ZY order for Unity coordinate system
+							image_width = level_grid[0] * level_grid[1]
+							image_height = level_grid[2]
+							
+							# Create image
+							image = bpy.data.images.new("3DtextureOutput", width=image_width, height=image_height, alpha=False, float_buffer=True, is_data=True)
+							
+							# Image content
+							image.pixels.foreach_set(pixels[suffix].ravel())
+							
+							# Save image
+							image.filepath_raw = filepath
+							if format == 'PNG':
+								image.file_format = 'PNG'
+							else:
+								image.file_format = 'OPEN_EXR'
+							with stats.stage('write', name):
+								image.save()
+							
+							# Remove the temporary image so repeated deliveries don't accumulate datablocks
+							bpy.data.images.remove(image)
+					if sequence != 'CONTAINER' or format != 'VF':
+						stats.add_file(filepath)
+				yield index + 1, len(frames)
+		finally:
+			# Containers are only recorded once closed, as their contents are still buffered until then
+			for writer in writers.values():
+				writer.close()
+				stats.add_file(writer.filepath)
+			if sequence != 'FRAME':
+				scene.frame_set(frame_current)
+	
+# DATA (XYZ POSITIONS)
+		
+	elif format == "CSV-1":
+		settings = bpy.context.scene.vf_delivery_settings
+		
+		# Sample every object in a single pass through the timeline
+		with stats.stage('depsgraph'):
+			times, matrices = yield from vf_sample_transforms(bpy.context.scene, objects, settings.csv_position, settings.csv_frame_step, settings.csv_subframes)
+		
+		# Write each file from the sampled positions, or the full transforms decomposed for all samples at once
+		for index, (obj, matrix) in enumerate(zip(objects, matrices)):
+			if settings.csv_data == 'TRANSFORM':
+				with stats.stage('encode', obj.name):
+					header, table, columns = vf_transform_columns(times, matrix, settings.csv_rotation_mode, settings.csv_rotation)
+				with stats.stage('write', obj.name):
+					vf_write_csv(location + obj.name + file_format, header, table)
+					if settings.csv_npz:
+						np.savez(location + obj.name + '.npz', **columns)
+				if settings.csv_npz:
+					stats.add_file(location + obj.name + '.npz')
 			else:
-				print(f"Selected object is not a mesh")
-				return {'CANCELLED'}
+				with stats.stage('write', obj.name):
+					vf_write_csv(location + obj.name + file_format, "x,y,z", matrix[:, :3, 3])
+			stats.add_file(location + obj.name + file_format)
+			yield index + 1, len(objects)
+	
+	elif format == "CSV-2":
+		point_format = bpy.context.scene.vf_delivery_settings.csv_point_format
+		file_format = VF_point_extensions[point_format]
+		for index, obj in enumerate(objects):
+			# Get evaluated object
+			with stats.stage('depsgraph', obj.name):
+				obj = bpy.context.evaluated_depsgraph_get().objects.get(obj.name)
+			
+			# Collect data with temporary mesh conversion
+			with stats.stage('read', obj.name):
+				positions = vf_read_positions(obj)
+			
+			# Save out point file
+			with stats.stage('write', obj.name):
+				vf_write_points(location + obj.name + file_format, positions, point_format)
+			stats.add_file(location + obj.name + file_format)
+			yield index + 1, len(objects)
+	
+	# Done
+	return {'FINISHED'}
+
+# Resolve the delivery file name and objects from the selection, or from the active collection when nothing is selected
+def vf_delivery_objects(context):
+	if context.object and context.object.select_get():
+		return context.active_object.name, list(context.selected_objects)
+	return context.collection.name, list(context.collection.all_objects)
+
+# Skip any non-mesh objects (except for item positions)
+def vf_delivery_filter(objects, file_type):
+	if file_type == "CSV-1":
+		return list(objects)
+	return [obj for obj in objects if obj.type in VF_delivery_object_types]
+
+# Get the active delivery preset, or None when presets are disabled or empty
+def vf_delivery_preset(settings):
+	if settings.use_preset and settings.preset_index < len(settings.presets):
+		preset = settings.presets[settings.preset_index]
+		if len(preset.targets):
+			return preset
+	return None
+
+# List the (file_type, file_location) pairs to deliver, one for each preset target or just the selected pipeline
+def vf_delivery_targets(settings, preset=None):
+	if preset is None:
+		return [(settings.file_type, settings.file_location)]
+	return [(target.file_type, os.path.join(settings.file_location, target.subfolder, '') if target.subfolder else settings.file_location) for target in preset.targets]
+
+# Deliver every target from the same resolved objects, so selection and depsgraph evaluation are shared and exporters run back to back
+# Each target's format and location are written into values and applied to the scene settings, so a caller resuming between steps can reapply them
+def vf_deliver_targets(context, targets, values, objects, file_name, report, stats=None):
+	settings = context.scene.vf_delivery_settings
+	result = {'FINISHED'}
+	for file_type, file_location in targets:
+		values['file_type'] = file_type
+		values['file_location'] = file_location
+		vf_settings_apply(settings, values)
 		
-# DATA (XYZ POSITIONS)
+		delivered = vf_delivery_filter(objects, file_type)
+		if not delivered:
+			report({'WARNING'}, "No objects to deliver as " + file_type)
+			continue
+		vf_select_only(delivered)
+		status = yield from vf_deliver_steps(context, delivered, file_name, report, stats)
+		if 'FINISHED' not in status:
+			result = status
+	return result
+
+# Read every delivery setting (except presets), so queued deliveries keep the settings they were requested with
+def vf_settings_values(settings):
+	values = {}
+	for prop in settings.bl_rna.properties:
+		if prop.identifier != 'rna_type' and prop.type not in ('POINTER', 'COLLECTION'):
+			value = getattr(settings, prop.identifier)
+			values[prop.identifier] = tuple(value) if getattr(prop, 'is_array', False) else value
+	return values
+
+# Apply previously read settings, returning the replaced values so they can be restored afterwards
+def vf_settings_apply(settings, values):
+	previous = vf_settings_values(settings)
+	for name, value in values.items():
+		if previous[name] != value:
+			setattr(settings, name, value)
+	return previous
+
+# A single delivery request (for the selection, or an explicit list of objects) that can run to completion or advance a few objects or frames at a time
+# The selection, active object, mode, and settings are swapped in for each advance and restored afterwards
+class VFDeliveryJob:
+	def __init__(self, context, objects=None):
+		settings = context.scene.vf_delivery_settings
+		self.scene = context.scene
+		self.values = vf_settings_values(settings)
+		self.location = bpy.path.abspath(settings.file_location)
+		self.stats = VFDeliveryStats(settings.use_report)
+		self.profiler = cProfile.Profile() if settings.use_profile else None
+		self.targets = vf_delivery_targets(settings, vf_delivery_preset(settings))
+		if objects is None:
+			self.file_name, self.objects = vf_delivery_objects(context)
+			self.active = context.active_object
+		else:
+			# Explicit objects are delivered using the first object as the file name and volume source
+			self.file_name, self.objects = objects[0].name, list(objects)
+			self.active = objects[0]
+		self.steps = None
+		self.progress = (0, 1)
+		self.result = None
+	
+	# Advance by up to limit objects or frames (or until finished when limit is None), returns True once the delivery is complete
+	def advance(self, context, report, limit=None):
+		stats = self.stats
+		settings = vf_settings_apply(self.scene.vf_delivery_settings, self.values)
+		if self.profiler:
+			self.profiler.enable()
+		
+		# Save selection, active object, and mode so they can be restored exactly after export
+		with stats.stage('selection'):
+			state = VFSelectionState(context)
+		try:
+			# Override the current mode to OBJECT
+			if context.active_object is not None and context.active_object.mode != 'OBJECT':
+				with stats.stage('mode switch'):
+					bpy.ops.object.mode_set(mode = 'OBJECT')
 			
-		elif format == "CSV-1":
-			# Save timeline position
-			frame_current = bpy.context.scene.frame_current
-			
-			# Set variables
-			frame_start = bpy.context.scene.frame_start
-			frame_end = bpy.context.scene.frame_end
-			space = bpy.context.scene.vf_delivery_settings.csv_position
-			
-			for obj in bpy.context.selected_objects:
-				# Collect data
-				array = [["x","y","z"]]
-				for i in range(frame_start, frame_end + 1):
-					bpy.context.scene.frame_set(i)
-					loc, rot, scale = obj.matrix_world.decompose() if space == "WORLD" else obj.matrix_local.decompose()
-					array.append([loc.x, loc.y, loc.z])
-				
-				# Save out CSV file
-				np.savetxt(
-					location + obj.name + file_format,
-					array,
-					delimiter = ",",
-					newline = '\n',
-					fmt = '% s'
-					)
-			
-			# Reset timeline position
-			bpy.context.scene.frame_set(frame_current)
-		
-		elif format == "CSV-2":
-			for obj in bpy.context.selected_objects:
-				# Get evaluated object
-				obj = bpy.context.evaluated_depsgraph_get().objects.get(obj.name)
-				
-				# Collect data with temporary mesh conversion
-				array = [["x","y","z"]]
-				for v in obj.to_mesh().vertices:
-					array.append([v.co.x, v.co.y, v.co.z])
-				
-				# Remove temporary mesh conversion
-				obj.to_mesh_clear()
-				
-				# Save out CSV file
-				np.savetxt(
-					location + obj.name + file_format,
-					array,
-					delimiter = ",",
-					newline = '\n',
-					fmt = '% s'
-					)
-		
-		if format != "CSV-1":
-			# Undo the previously completed non-mesh object deselection
-			bpy.ops.ed.undo()
-			
-		# Reset to original mode
-		if active_object is not None:
-			bpy.ops.object.mode_set(mode = object_mode)
-		
-		# Done
+			# Exporters work on the selection, so select exactly the objects being delivered
+			with stats.stage('selection'):
+				vf_select_only(self.objects)
+				context.view_layer.objects.active = self.active
+			
+			# The global context is used because operator contexts are only valid during each call
+			if self.steps is None:
+				self.steps = vf_deliver_targets(bpy.context, self.targets, self.values, self.objects, self.file_name, report, stats)
+			count = 0
+			while limit is None or count < limit:
+				try:
+					self.progress = next(self.steps)
+				except StopIteration as stop:
+					self.result = stop.value
+					return True
+				count += 1
+			return False
+		finally:
+			# Reset to the original selection, active object, mode, and settings
+			with stats.stage('restore'):
+				state.restore()
+			if self.profiler:
+				self.profiler.disable()
+			vf_settings_apply(self.scene.vf_delivery_settings, settings)
+	
+	# Stop between files, leaving everything already written intact (open containers are closed and the frame is restored)
+	def cancel(self):
+		if self.steps is not None:
+			self.steps.close()
+		self.result = {'CANCELLED'}
+	
+	# Save the profile and timing report next to the delivered files
+	def finish(self, report):
+		self.stats.finish()
+		if self.profiler and os.path.isdir(self.location):
+			self.profiler.dump_stats(os.path.join(self.location, 'delivery_profile.prof'))
+		if self.stats.enabled and os.path.isdir(self.location):
+			settings = vf_settings_apply(self.scene.vf_delivery_settings, self.values)
+			self.stats.write(self.location, self.scene.vf_delivery_settings)
+			vf_settings_apply(self.scene.vf_delivery_settings, settings)
+			report({'INFO'}, "Delivered " + self.stats.summary())
+		return self.result
+
+# Deliveries waiting for the running background delivery, the first job is the one in progress
+VF_delivery_jobs = []
+
+class VFDELIVERY_OT_file(bpy.types.Operator):
+	bl_idname = "vfdelivery.file"
+	bl_label = "Deliver File"
+	bl_description = "Quickly export selected objects or collection to a specified directory"
+#	bl_options = {'REGISTER', 'UNDO'}
+	
+	def execute(self, context):
+		job = VFDeliveryJob(context)
+		try:
+			job.advance(context, self.report)
+		finally:
+			result = job.finish(self.report)
+		return result
+	
+	def invoke(self, context, event):
+		if not context.scene.vf_delivery_settings.use_background and not VF_delivery_jobs:
+			return self.execute(context)
+		
+		# Queue the request behind a delivery that's already running
+		VF_delivery_jobs.append(VFDeliveryJob(context))
+		if len(VF_delivery_jobs) > 1:
+			self.report({'INFO'}, "Delivery queued (" + str(len(VF_delivery_jobs) - 1) + " waiting)")
+			return {'FINISHED'}
+		
+		# Export one object or frame per timer tick so Blender stays responsive
+		wm = context.window_manager
+		self.timer = wm.event_timer_add(0.01, window = context.window)
+		wm.modal_handler_add(self)
+		wm.progress_begin(0, 100)
+		return {'RUNNING_MODAL'}
+	
+	def modal(self, context, event):
+		# The queue is cleared when another file is loaded or the add-on is disabled
+		if not VF_delivery_jobs:
+			self.stop(context)
+			return {'CANCELLED'}
+		
+		if event.type == 'ESC' and event.value == 'PRESS':
+			self.cancel(context)
+			self.report({'WARNING'}, "Delivery cancelled, files already written were kept")
+			return {'CANCELLED'}
+		
+		if event.type != 'TIMER' or event.timer is not self.timer:
+			return {'PASS_THROUGH'}
+		
+		job = VF_delivery_jobs[0]
+		try:
+			finished = job.advance(context, self.report, 1)
+		except Exception as exc:
+			# Objects can be deleted or renamed while the delivery is running
+			job.cancel()
+			self.report({'ERROR'}, "Delivery of " + job.file_name + " failed: " + str(exc))
+			finished = True
+		
+		# Show progress in the window manager and status bar
+		done, total = job.progress
+		context.window_manager.progress_update(int(100 * done / max(total, 1)))
+		status = "Delivering " + job.file_name + " " + job.values['file_type'] + ": " + str(done) + " / " + str(total)
+		if len(VF_delivery_jobs) > 1:
+			status += " (" + str(len(VF_delivery_jobs) - 1) + " queued)"
+		context.workspace.status_text_set(status + ", Esc to cancel")
+		
+		if finished:
+			try:
+				self.finish(job)
+			finally:
+				VF_delivery_jobs.pop(0)
+			if not VF_delivery_jobs:
+				self.stop(context)
+				return {'FINISHED'}
+		return {'PASS_THROUGH'}
+	
+	# Save the job's report, so a failure writing it can't stall the deliveries queued behind it
+	def finish(self, job):
+		try:
+			job.finish(self.report)
+		except Exception as exc:
+			self.report({'ERROR'}, "Delivery report for " + job.file_name + " could not be saved: " + str(exc))
+	
+	# Cancel the running delivery and everything queued behind it
+	# Also called by Blender when it removes the modal handler, for example when the window is closed
+	def cancel(self, context):
+		try:
+			for job in VF_delivery_jobs:
+				started = job.steps is not None
+				job.cancel()
+				if started:
+					self.finish(job)
+		finally:
+			VF_delivery_jobs.clear()
+			self.stop(context)
+	
+	def stop(self, context):
+		wm = context.window_manager
+		wm.event_timer_remove(self.timer)
+		wm.progress_end()
+		if context.workspace is not None:
+			context.workspace.status_text_set(None)
+
+class VFDELIVERY_OT_preset_add(bpy.types.Operator):
+	bl_idname = "vfdelivery.preset_add"
+	bl_label = "Add Preset"
+	bl_description = "Add a delivery preset starting with the current pipeline"
+	
+	def execute(self, context):
+		settings = context.scene.vf_delivery_settings
+		preset = settings.presets.add()
+		preset.name = "Preset " + str(len(settings.presets))
+		target = preset.targets.add()
+		target.file_type = settings.file_type
+		target.subfolder = settings.file_type.lower()
+		settings.preset_index = len(settings.presets) - 1
+		return {'FINISHED'}
+
+class VFDELIVERY_OT_preset_remove(bpy.types.Operator):
+	bl_idname = "vfdelivery.preset_remove"
+	bl_label = "Remove Preset"
+	bl_description = "Remove the active delivery preset"
+	
+	def execute(self, context):
+		settings = context.scene.vf_delivery_settings
+		if settings.preset_index < len(settings.presets):
+			settings.presets.remove(settings.preset_index)
+			settings.preset_index = max(0, min(settings.preset_index, len(settings.presets) - 1))
 		return {'FINISHED'}
 
+class VFDELIVERY_OT_target_add(bpy.types.Operator):
+	bl_idname = "vfdelivery.target_add"
+	bl_label = "Add Target"
+	bl_description = "Add another format to the active delivery preset"
+	
+	def execute(self, context):
+		settings = context.scene.vf_delivery_settings
+		if settings.preset_index < len(settings.presets):
+			target = settings.presets[settings.preset_index].targets.add()
+			target.file_type = settings.file_type
+			target.subfolder = settings.file_type.lower()
+		return {'FINISHED'}
+
+class VFDELIVERY_OT_target_remove(bpy.types.Operator):
+	bl_idname = "vfdelivery.target_remove"
+	bl_label = "Remove Target"
+	bl_description = "Remove this format from the active delivery preset"
+	
+	index: bpy.props.IntProperty()
+	
+	def execute(self, context):
+		settings = context.scene.vf_delivery_settings
+		if settings.preset_index < len(settings.presets):
+			settings.presets[settings.preset_index].targets.remove(self.index)
+		return {'FINISHED'}
+
+###########################################################################
+# Watch mode
+
+# Names of selected objects changed since the last watch delivery, the time of the latest change, the running watch job, and the fingerprints last delivered
+VF_watch = {'changed': set(), 'time': 0.0, 'busy': False, 'job': None, 'fingerprints': {}}
+
+# Record selected objects whose geometry or transforms change, restarting the quiet period with every change
+@persistent
+def vf_delivery_watch(scene, depsgraph):
+	if VF_watch['busy'] or not scene.vf_delivery_settings.use_watch:
+		return
+	changed = VF_watch['changed']
+	for update in depsgraph.updates:
+		if isinstance(update.id, bpy.types.Object) and (update.is_updated_geometry or update.is_updated_transform):
+			obj = update.id.original
+			if obj.select_get():
+				changed.add(obj.name)
+	if changed:
+		VF_watch['time'] = time.perf_counter()
+		if not bpy.app.timers.is_registered(vf_delivery_watch_timer):
+			bpy.app.timers.register(vf_delivery_watch_timer, first_interval = scene.vf_delivery_settings.watch_delay)
+
+# Messages from watch deliveries go to the system console
+def vf_delivery_watch_report(type, message):
+	print("VF Delivery: " + message)
+
+# Create one delivery job for every recorded object that really changed since it was last delivered
+# Fingerprints filter out repeated notifications, including the updates caused by the delivery itself
+def vf_delivery_watch_job(context):
+	settings = context.scene.vf_delivery_settings
+	depsgraph = context.evaluated_depsgraph_get()
+	names = sorted(VF_watch['changed'])
+	VF_watch['changed'].clear()
+	objects = []
+	for name in names:
+		obj = context.scene.objects.get(name)
+		if obj is None:
+			continue
+		fingerprint = vf_fingerprint(obj, depsgraph, settings)
+		if VF_watch['fingerprints'].get(name) != fingerprint:
+			VF_watch['fingerprints'][name] = fingerprint
+			objects.append(obj)
+	if not objects:
+		return None
+	
+	# Combined files always contain the whole selection
+	if settings.file_grouping == "COMBINED" and settings.file_type in ("FBX", "GLB", "OBJ", "USDZ", "STL"):
+		return VFDeliveryJob(context)
+	return VFDeliveryJob(context, objects)
+
+# Wait until no changes have arrived for the quiet period, then deliver the changed objects one object or frame per call
+def vf_delivery_watch_timer():
+	context = bpy.context
+	settings = context.scene.vf_delivery_settings
+	job = VF_watch['job']
+	if job is None:
+		if not settings.use_watch:
+			VF_watch['changed'].clear()
+			return None
+		
+		# Keep waiting while changes are still arriving, a manual delivery is running, or an object is being edited
+		wait = VF_watch['time'] + settings.watch_delay - time.perf_counter()
+		if wait > 0.0 or VF_delivery_jobs or context.mode != 'OBJECT':
+			return max(wait, 0.25)
+		
+		job = VF_watch['job'] = vf_delivery_watch_job(context)
+		if job is None:
+			return None
+	
+	VF_watch['busy'] = True
+	try:
+		finished = job.advance(context, vf_delivery_watch_report, 1)
+	except Exception as exc:
+		job.cancel()
+		vf_delivery_watch_report({'ERROR'}, "Watch delivery of " + job.file_name + " failed: " + str(exc))
+		finished = True
+	finally:
+		VF_watch['busy'] = False
+	if not finished:
+		return 0.01
+	
+	try:
+		job.finish(vf_delivery_watch_report)
+	except Exception as exc:
+		vf_delivery_watch_report({'ERROR'}, "Watch delivery report for " + job.file_name + " could not be saved: " + str(exc))
+	finally:
+		VF_watch['job'] = None
+	
+	# Changes made during the delivery are collected into the next pass
+	return settings.watch_delay if VF_watch['changed'] else None
+
+# Drop running and queued deliveries when another file is loaded or the add-on is disabled
+# Running jobs are cancelled first, so open containers are closed while their scene still exists
+@persistent
+def vf_delivery_reset(*args):
+	for job in VF_delivery_jobs + ([VF_watch['job']] if VF_watch['job'] else []):
+		try:
+			job.cancel()
+			job.stats.finish()
+		except Exception:
+			pass
+	VF_delivery_jobs.clear()
+	VF_watch['job'] = None
+	VF_watch['busy'] = False
+	VF_watch['changed'].clear()
+	VF_watch['fingerprints'].clear()
+	if bpy.app.timers.is_registered(vf_delivery_watch_timer):
+		bpy.app.timers.unregister(vf_delivery_watch_timer)
+
 ###########################################################################
 # Project settings and UI rendering classes
 
+VF_delivery_formats = [
+	('FBX', 'FBX — Unity 3D', 'Export FBX binary file for Unity 3D'),
+	('GLB', 'GLB — ThreeJS', 'Export GLTF compressed binary file for ThreeJS'),
+	('OBJ', 'OBJ — Element3D', 'Export OBJ file for VideoCopilot Element 3D'),
+	('USDZ', 'USDZ — Xcode', 'Export USDZ file for Apple platforms including Xcode'),
+	(None),
+	('STL', 'STL — 3D Printing', 'Export individual STL file of each selected object for 3D printing'),
+	(None),
+	('VF', 'VF — Unity 3D Volume Field', 'Export volume field for Unity 3D (best used with the VFX Graph)'),
+	('PNG', 'PNG — 3D Texture Strip', 'Export volume field as an image strip for Godot, Unity 3D, or Unreal Engine'),
+	('EXR', 'EXR — 3D Texture Strip', 'Export volume field as an image strip for Godot, Unity 3D, or Unreal Engine'),
+	(None),
+	('CSV-1', 'CSV — Item Position', 'Export CSV file of the selected object\'s position for all frames within the render range'),
+	('CSV-2', 'CSV — Point Position', 'Export CSV file of the selected object\'s points in object space')
+	]
+
+# A single format and subfolder within a delivery preset
+class vfDeliveryTarget(bpy.types.PropertyGroup):
+	file_type: bpy.props.EnumProperty(
+		name = 'Pipeline',
+		description = 'Sets the format for this delivery target',
+		items = VF_delivery_formats,
+		default = 'FBX')
+	subfolder: bpy.props.StringProperty(
+		name = 'Subfolder',
+		description = 'Subfolder within the delivery location for this target (leave empty to use the delivery location)',
+		default = '',
+		maxlen = 1024)
+
+# A named list of delivery targets that are delivered together in one pass
+class vfDeliveryPreset(bpy.types.PropertyGroup):
+	name: bpy.props.StringProperty(
+		name = 'Name',
+		description = 'Delivery preset name',
+		default = 'Preset')
+	targets: bpy.props.CollectionProperty(type = vfDeliveryTarget)
+
 class vfDeliverySettings(bpy.types.PropertyGroup):
 	file_type: bpy.props.EnumProperty(
 		name = 'Pipeline',
 		description = 'Sets the format for delivery output',
-		items = [
-			('FBX', 'FBX — Unity 3D', 'Export FBX binary file for Unity 3D'),
-			('GLB', 'GLB — ThreeJS', 'Export GLTF compressed binary file for ThreeJS'),
-			('OBJ', 'OBJ — Element3D', 'Export OBJ file for VideoCopilot Element 3D'),
-			('USDZ', 'USDZ — Xcode', 'Export USDZ file for Apple platforms including Xcode'),
-			(None),
-			('STL', 'STL — 3D Printing', 'Export individual STL file of each selected object for 3D printing'),
-			(None),
-			('VF', 'VF — Unity 3D Volume Field', 'Export volume field for Unity 3D (best used with the VFX Graph)'),
-			('PNG', 'PNG — 3D Texture Strip', 'Export volume field as an image strip for Godot, Unity 3D, or Unreal Engine'),
-			('EXR', 'EXR — 3D Texture Strip', 'Export volume field as an image strip for Godot, Unity 3D, or Unreal Engine'),
-			(None),
-			('CSV-1', 'CSV — Item Position', 'Export CSV file of the selected object\'s position for all frames within the render range'),
-			('CSV-2', 'CSV — Point Position', 'Export CSV file of the selected object\'s points in object space')
-			],
+		items = VF_delivery_formats,
 		default = 'FBX')
 	file_location: bpy.props.StringProperty(
 		name = "Delivery Location",
@@ -567,6 +2370,170 @@ class vfDeliverySettings(bpy.types.PropertyGroup):
 		soft_max= 1.0,
 		min=-1000.0,
 		max= 1000.0)
+	strip_encoder: bpy.props.EnumProperty(
+		name = 'Encoder',
+		description = 'Sets how texture strip images are written',
+		items = [
+			('DIRECT', 'Direct', 'Write PNG and EXR files directly from the point data'),
+			('IMAGE', 'Image', 'Save through a temporary Blender image (slower fallback)')
+			],
+		default = 'DIRECT')
+	use_incremental: bpy.props.BoolProperty(
+		name = 'Skip Unchanged',
+		description = 'Skip mesh exports when the geometry, transforms, modifiers, materials, animation, and settings are unchanged since the last delivery to this folder',
+		default = False)
+	use_draco_tune: bpy.props.BoolProperty(
+		name = 'Tune Compression',
+		description = 'Search a small grid of Draco compression levels and position quantization settings for each GLB file, keeping the smallest result within the tolerance (choices are cached in the delivery folder)',
+		default = False)
+	draco_tolerance: bpy.props.FloatProperty(
+		name = 'Tolerance',
+		description = 'Largest distance any vertex may move from the uncompressed mesh when tuning Draco compression',
+		default = 0.001,
+		min = 0.0,
+		soft_max = 0.1,
+		precision = 4,
+		subtype = 'DISTANCE')
+	use_watch: bpy.props.BoolProperty(
+		name = 'Watch',
+		description = 'Automatically deliver selected objects again when their geometry or transforms change (edits are delivered after leaving edit mode)',
+		default = False)
+	watch_delay: bpy.props.FloatProperty(
+		name = 'Quiet Period',
+		description = 'Seconds without further changes before changed objects are delivered again',
+		default = 1.0,
+		min = 0.1,
+		soft_max = 10.0,
+		subtype = 'TIME_ABSOLUTE')
+	use_report: bpy.props.BoolProperty(
+		name = 'Report',
+		description = 'Save per-stage timing, memory, and file size details to delivery_report.json in the delivery location',
+		default = False)
+	use_profile: bpy.props.BoolProperty(
+		name = 'Profile',
+		description = 'Save a cProfile dump of the whole delivery to delivery_profile.prof in the delivery location',
+		default = False)
+	use_preset: bpy.props.BoolProperty(
+		name = 'Use Presets',
+		description = 'Deliver every target format in the active preset in one pass',
+		default = False)
+	presets: bpy.props.CollectionProperty(type = vfDeliveryPreset)
+	preset_index: bpy.props.IntProperty(
+		name = 'Active Preset',
+		default = 0,
+		min = 0)
+	use_background: bpy.props.BoolProperty(
+		name = 'Background',
+		description = 'Deliver one object or frame at a time while Blender stays responsive (Esc cancels, further deliveries are queued)',
+		default = False)
+	instance_mode: bpy.props.EnumProperty(
+		name = 'Instances',
+		description = 'Sets how linked duplicates are delivered with individual grouping',
+		items = [
+			('OFF', 'All', 'Export every object in full'),
+			('MANIFEST', 'Shared', 'Export each unique geometry once in local space, and list every placement in delivery_instances.json'),
+			('LINK', 'Linked', 'Export each unique geometry once in local space, list every placement, and hard link (or copy) the shared file under each object name')
+			],
+		default = 'OFF')
+	use_parallel: bpy.props.BoolProperty(
+		name = 'Parallel',
+		description = 'Export individual files using background Blender processes (the current file is temporarily saved as a copy)',
+		default = False)
+	parallel_workers: bpy.props.IntProperty(
+		name = 'Workers',
+		description = 'Number of background Blender processes used for parallel export',
+		default = 4,
+		min = 1,
+		soft_max = 16)
+	strip_channels: bpy.props.EnumProperty(
+		name = 'Channels',
+		description = 'Sets the colour channels used for texture strips written by the direct encoder',
+		items = [
+			('RGB', 'RGB', 'Store values in all three colour channels'),
+			('COMPACT', 'Compact', 'Store values in a single red channel and vectors in RGB')
+			],
+		default = 'RGB')
+	png_depth: bpy.props.EnumProperty(
+		name = 'Depth',
+		description = 'Sets the bit depth of PNG texture strips written by the direct encoder',
+		items = [
+			('8', '8 bit', '8-bit quantisation of the remapped range'),
+			('16', '16 bit', '16-bit quantisation of the remapped range')
+			],
+		default = '8')
+	exr_precision: bpy.props.EnumProperty(
+		name = 'Precision',
+		description = 'Sets the precision of EXR texture strips written by the direct encoder',
+		items = [
+			('FLOAT32', 'Float', '32-bit floating point values'),
+			('FLOAT16', 'Half', '16-bit floating point values')
+			],
+		default = 'FLOAT32')
+	volume_limit: bpy.props.IntProperty(
+		name = 'Point Limit',
+		description = 'Maximum number of points allowed in a volume field export',
+		default = VF_volume_limit,
+		min = 1)
+	vf_version: bpy.props.EnumProperty(
+		name = 'Version',
+		description = 'Sets the volume field file format version',
+		items = [
+			('V1', 'Unity', 'Original Unity volume field format with 16-bit dimensions and float32 values'),
+			('V2', 'Version 2', 'Versioned container with 32-bit dimensions, selectable precision, and optional compression (requires a compatible importer)')
+			],
+		default = 'V1')
+	vf_precision: bpy.props.EnumProperty(
+		name = 'Precision',
+		description = 'Sets the precision of version 2 volume field values',
+		items = [
+			('FLOAT32', 'Float', '32-bit floating point values'),
+			('FLOAT16', 'Half', '16-bit floating point values')
+			],
+		default = 'FLOAT32')
+	vf_compression: bpy.props.BoolProperty(
+		name = 'Compress',
+		description = 'Compress version 2 volume field data using zlib',
+		default = False)
+	vf_bricks: bpy.props.EnumProperty(
+		name = 'Layout',
+		description = 'Sets how version 2 volume field values are stored',
+		items = [
+			('0', 'Dense', 'Store every value'),
+			('4', 'Sparse 4³', 'Split the volume into 4 x 4 x 4 bricks, storing empty or uniform bricks as a single value'),
+			('8', 'Sparse 8³', 'Split the volume into 8 x 8 x 8 bricks, storing empty or uniform bricks as a single value'),
+			('16', 'Sparse 16³', 'Split the volume into 16 x 16 x 16 bricks, storing empty or uniform bricks as a single value')
+			],
+		default = '0')
+	volume_sequence: bpy.props.EnumProperty(
+		name = 'Frames',
+		description = 'Exports the current frame or every frame in the scene range',
+		items = [
+			('FRAME', 'Current', 'Export the current frame only'),
+			('FILES', 'Numbered', 'Export every frame in the scene range as numbered files'),
+			('CONTAINER', 'Container', 'Export every frame in the scene range into a single version 2 volume field file (PNG and EXR use numbered files)')
+			],
+		default = 'FRAME')
+	volume_mips: bpy.props.EnumProperty(
+		name = 'Levels',
+		description = 'Exports downsampled copies of the volume next to the base file',
+		items = [
+			('NONE', 'None', 'Export the full resolution volume only'),
+			('CHAIN', 'Mip Chain', 'Export every level of a 3D mip chain, halving each axis down to a single point (_mip1, _mip2, ...)'),
+			('FACTORS', 'Factors', 'Export the volume divided by each of the listed factors (_down2, _down4, ...)')
+			],
+		default = 'NONE')
+	volume_mip_factors: bpy.props.StringProperty(
+		name = 'Factors',
+		description = 'Comma separated downsample factors',
+		default = '2,4')
+	volume_mip_filter: bpy.props.EnumProperty(
+		name = 'Filter',
+		description = 'Sets the reduction filter used for downsampled levels',
+		items = [
+			('BOX', 'Box', 'Average all points covered by each downsampled point'),
+			('TRILINEAR', 'Trilinear', 'Interpolate between the nearest points at each downsampled point centre')
+			],
+		default = 'BOX')
 	csv_position: bpy.props.EnumProperty(
 		name = 'Position',
 		description = 'Sets local or world space coordinates',
@@ -575,14 +2542,204 @@ class vfDeliverySettings(bpy.types.PropertyGroup):
 			('LOCAL', 'Local', 'Local object space')
 			],
 		default = 'WORLD')
-#	csv_rotation: bpy.props.EnumProperty(
-#		name = 'Rotation',
-#		description = 'Sets the formatting of rotation values',
-#		items = [
-#			('RAD', 'Radians', 'Output rotation in radians'),
-#			('DEG', 'Degrees', 'Output rotation in degrees')
-#			],
-#		default = 'RAD')
+	csv_point_format: bpy.props.EnumProperty(
+		name = 'Output',
+		description = 'Sets the file format for point position data',
+		items = [
+			('CSV', 'CSV', 'Plain text x,y,z values'),
+			('NPY', 'NPY', 'NumPy array file of float32 x,y,z values'),
+			('PLY', 'PLY', 'Binary little-endian PLY point cloud'),
+			('RAW', 'RAW', 'Headerless little-endian float32 x,y,z values')
+			],
+		default = 'CSV')
+	csv_frame_step: bpy.props.IntProperty(
+		name = 'Step',
+		description = 'Number of frames between each sample',
+		default = 1,
+		min = 1,
+		soft_max = 10)
+	csv_subframes: bpy.props.IntProperty(
+		name = 'Subframes',
+		description = 'Number of evenly spaced samples taken within each sampled frame',
+		default = 1,
+		min = 1,
+		soft_max = 10)
+	csv_data: bpy.props.EnumProperty(
+		name = 'Data',
+		description = 'Sets the item data exported for each sample',
+		items = [
+			('POSITION', 'Position', 'Export x,y,z location values'),
+			('TRANSFORM', 'Transform', 'Export frame, location, rotation, and scale values for tracking data')
+			],
+		default = 'POSITION')
+	csv_rotation_mode: bpy.props.EnumProperty(
+		name = 'Rotation Mode',
+		description = 'Sets the rotation representation for transform data',
+		items = [
+			('EULER', 'Euler', 'XYZ Euler angles'),
+			('QUATERNION', 'Quaternion', 'Normalised w,x,y,z quaternions')
+			],
+		default = 'EULER')
+	csv_rotation: bpy.props.EnumProperty(
+		name = 'Rotation',
+		description = 'Sets the formatting of rotation values',
+		items = [
+			('RAD', 'Radians', 'Output rotation in radians'),
+			('DEG', 'Degrees', 'Output rotation in degrees')
+			],
+		default = 'RAD')
+	csv_npz: bpy.props.BoolProperty(
+		name = 'NPZ',
+		description = 'Also save transform data as named NumPy columns (frame, location, rotation, scale) in an .npz file for tools that load millions of samples',
+		default = True)
+
+# Selection summary cache, invalidated by scene changes so the panel doesn't scan the selection on every redraw
+VF_summary_cache = {}
+
+@persistent
+def vf_delivery_invalidate(*args):
+	VF_summary_cache.clear()
+
+# Estimate the size of a single volume output from the grid dimensions and output settings
+# Attributes created by modifiers aren't available without evaluation, so they are assumed to be vectors
+def vf_volume_size_estimate(settings, file_type, obj):
+	points = obj.data['vf_point_grid_x'] * obj.data['vf_point_grid_y'] * obj.data['vf_point_grid_z']
+	attribute = obj.data.attributes.get(VF_volume_attribute)
+	channels = 1 if attribute is not None and attribute.data_type == 'FLOAT' else 3
+	compressed = True
+	if file_type == "VF":
+		container = settings.vf_version == 'V2' or settings.volume_sequence == 'CONTAINER'
+		size = points * channels * (2 if container and settings.vf_precision == 'FLOAT16' else 4) + (VF2_header.size + VF2_chunk.size if container else VF_header.size)
+		compressed = container and (settings.vf_compression or settings.vf_bricks != '0')
+	elif settings.strip_encoder == 'DIRECT':
+		channels = channels if settings.strip_channels == 'COMPACT' else 3 # Values are copied into all three colour channels unless compact
+		if file_type == "PNG":
+			size = points * channels * (2 if settings.png_depth == '16' else 1)
+		else:
+			size = points * channels * (2 if settings.exr_precision == 'FLOAT16' else 4)
+	else:
+		size = points * 3 * (1 if file_type == "PNG" else 4)
+	return 'Size: ' + ('up to ' if compressed else '') + vf_format_bytes(size) + (' per frame' if settings.volume_sequence != 'FRAME' else '')
+
+# Summarise the objects that one format will deliver, returning the button state and any validation messages
+def vf_delivery_summary_format(context, settings, file_type):
+	active = context.active_object
+	collection = context.collection
+	
+	# Set up variables
+	file_format = "." + file_type.lower().split("-")[0] # Get only the characters before a dash to support multiple variations of a single format
+	volume = file_type == "VF" or file_type == "PNG" or file_type == "EXR"
+	csv = file_type == "CSV-1" or file_type == "CSV-2"
+	button_enable = True
+	button_icon = "FILE"
+	button_title = ''
+	info_box = ''
+	object_count = 0
+	
+	# Point positions use the extension of the selected output format
+	if file_type == "CSV-2":
+		file_format = VF_point_extensions[settings.csv_point_format]
+	
+	# Check if at least one object is selected
+	if context.object and context.object.select_get():
+		# Volume Field: count only an active mesh with the necessary data elements
+		# Does not check for named attributes, however, since that requires applying all modifiers
+		if volume:
+			obj = context.object
+			# Validate object data (doesn't check if the geometry nodes modifier actually includes a named attribute)
+			if obj.type == 'MESH' and len(obj.data.vertices) <= settings.volume_limit and obj.data.get('vf_point_grid_x') is not None and obj.data.get('vf_point_grid_y') is not None and obj.data.get('vf_point_grid_z') is not None and (VF_volume_attribute in obj.data.attributes or any(modifier.type == 'NODES' for modifier in obj.modifiers)):
+				object_count = 1
+#				info_box = 'Volume export requires,"field_vector" attribute in,Geometry Node modifier'
+				if file_type == "PNG" or file_type == "EXR":
+					info_box = 'Columns: ' + str(obj.data["vf_point_grid_y"]) + ','
+				info_box += vf_volume_size_estimate(settings, file_type, obj)
+			else:
+				info_box = 'Volume export requires:,mesh with <=' + str(settings.volume_limit) + ' points,"vf_point_grid..." properties,"field_vector" attribute'
+		else:
+			selected = context.selected_objects
+			# CSV: count any items
+			if file_type == "CSV-1":
+				object_count = len(selected)
+			# Geometry: count only supported meshes and curves that are not hidden
+			else:
+				object_count = sum(1 for obj in selected if obj.type in VF_delivery_object_types)
+		
+		# Button title
+		if object_count > 1 and settings.file_grouping == "COMBINED" and not csv:
+			button_title = active.name + file_format
+		elif object_count == 1:
+			if active.type not in VF_delivery_object_types and settings.file_grouping == "INDIVIDUAL":
+				for obj in context.selected_objects:
+					if obj.type in VF_delivery_object_types:
+						button_title = obj.name + file_format
+			else:
+				button_title = active.name + file_format
+		else:
+			button_title = str(object_count) + " files"
+		
+		# Button icon
+		button_icon = "OUTLINER_OB_MESH"
+	
+	# Active collection fallback (except for Volume Field)
+	elif not volume:
+		# Volume Field: requires an active mesh object, collections are not supported
+		# CSV-1: count any items within the collection
+		if file_type == "CSV-1":
+			object_count = len(collection.all_objects)
+		# Geometry: count only supported data types (mesh, curve, etcetera) for everything else
+		else:
+			object_count = sum(1 for obj in collection.all_objects if obj.type in VF_delivery_object_types)
+		
+		# Button title
+		if settings.file_grouping == "COMBINED" and not csv:
+			button_title = collection.name + file_format
+		else:
+			button_title = str(object_count) + " files"
+		
+		# Button icon
+		button_icon = "OUTLINER_COLLECTION"
+	
+	# If no usable items (CSV-1) or meshes (everything else) are found, disable the button
+	# Keeping the message generic allows this to be used universally
+	if object_count == 0:
+		button_enable = False
+		button_icon = "X"
+		if file_type == "CSV-1":
+			button_title = "Select item"
+		else:
+			button_title = "Select mesh"
+	
+	return {
+		'object_count': object_count,
+		'button_enable': button_enable,
+		'button_icon': button_icon,
+		'button_title': button_title,
+		'info_box': info_box,
+		}
+
+# Summarise the objects that will be delivered, returning the button state and any validation messages
+# Presets can be delivered when any of their targets has objects, and show the details of the first target that does
+def vf_delivery_summary(context):
+	settings = context.scene.vf_delivery_settings
+	preset = vf_delivery_preset(settings)
+	file_types = [target.file_type for target in preset.targets] if preset else [settings.file_type]
+	active = context.active_object
+	collection = context.collection
+	key = (context.scene.name, context.view_layer.name, collection.name if collection else '', active.name if active else '', tuple(file_types), preset.name if preset else '', settings.file_grouping, settings.csv_point_format, settings.volume_limit, settings.volume_sequence, settings.vf_version, settings.vf_precision, settings.vf_compression, settings.vf_bricks, settings.strip_encoder, settings.strip_channels, settings.png_depth, settings.exr_precision)
+	if VF_summary_cache.get('key') == key:
+		return VF_summary_cache['summary']
+	
+	summaries = [vf_delivery_summary_format(context, settings, file_type) for file_type in file_types]
+	summary = next((summary for summary in summaries if summary['object_count']), summaries[0])
+	
+	# Presets are named after the preset and its formats
+	if preset and summary['object_count']:
+		summary['button_title'] = preset.name + " (" + ", ".join(file_types) + ")"
+		summary['button_icon'] = "PRESET"
+	
+	VF_summary_cache['key'] = key
+	VF_summary_cache['summary'] = summary
+	return summary
 
 class VFTOOLS_PT_delivery(bpy.types.Panel):
 	bl_space_type = "VIEW_3D"
@@ -606,132 +2763,304 @@ class VFTOOLS_PT_delivery(bpy.types.Panel):
 	def draw(self, context):
 		try:
 			# Set up variables
-			file_format = "." + context.scene.vf_delivery_settings.file_type.lower().split("-")[0] # Get only the characters before a dash to support multiple variations of a single format
-			button_enable = True
-			button_icon = "FILE"
-			button_title = ''
-			info_box = ''
-			show_group = True
+			settings = context.scene.vf_delivery_settings
+			preset = vf_delivery_preset(settings)
+			file_types = [target.file_type for target in preset.targets] if preset else [settings.file_type]
+			summary = vf_delivery_summary(context)
+			show_group = False
+			show_mesh = False
+			show_glb = False
 			show_range = False
+			show_volume = False
+			show_limit = False
+			show_strip = False
+			show_exr = False
 			show_csv = False
-			object_count = 0
-			
-			# Check if at least one object is selected
-			if bpy.context.object and bpy.context.object.select_get():
-				# Volume Field: count only an active mesh with the necessary data elements
-				# Does not check for named attributes, however, since that requires applying all modifiers
-				if context.scene.vf_delivery_settings.file_type == "VF" or context.scene.vf_delivery_settings.file_type == "PNG" or context.scene.vf_delivery_settings.file_type == "EXR":
-					obj = bpy.context.object
-					# Validate object data (doesn't check if the geometry nodes modifier actually includes a named attribute)
-					if obj.type == 'MESH' and len(obj.data.vertices) <= 65536 and obj.data.get('vf_point_grid_x') is not None and obj.data.get('vf_point_grid_y') is not None and obj.data.get('vf_point_grid_z') is not None and ('field_vector' in obj.data.attributes or 'NODES' in [modifier.type for modifier in obj.modifiers]):
-						object_count = 1
-#						info_box = 'Volume export requires,"field_vector" attribute in,Geometry Node modifier'
-						if context.scene.vf_delivery_settings.file_type == "PNG" or context.scene.vf_delivery_settings.file_type == "EXR":
-							info_box = 'Columns: ' + str(obj.data["vf_point_grid_y"])
-					else:
-						info_box = 'Volume export requires:,mesh with <=65536 points,"vf_point_grid..." properties,"field_vector" attribute'
-				# CSV: count any items
-				elif context.scene.vf_delivery_settings.file_type == "CSV-1":
-					object_count = len(bpy.context.selected_objects)
-				# Geometry: count only supported meshes and curves that are not hidden
-				else:
-					object_count = len([obj for obj in bpy.context.selected_objects if obj.type in VF_delivery_object_types])
+			show_points = False
+			
+			# Specific display cases (presets show the options of every target format)
+			for file_type in file_types:
+				if file_type == "FBX" or file_type == "GLB" or file_type == "OBJ" or file_type == "USDZ":
+					show_group = True
+					show_mesh = True
 				
-				# Button title
-				if (object_count > 1 and context.scene.vf_delivery_settings.file_grouping == "COMBINED" and not (context.scene.vf_delivery_settings.file_type == "CSV-1" or context.scene.vf_delivery_settings.file_type == "CSV-2")):
-					button_title = bpy.context.active_object.name + file_format
-				elif object_count == 1:
-					if bpy.context.active_object.type not in VF_delivery_object_types and context.scene.vf_delivery_settings.file_grouping == "INDIVIDUAL":
-						for obj in bpy.context.selected_objects:
-							if obj.type in VF_delivery_object_types:
-								button_title = obj.name + file_format
-					else:
-						button_title = bpy.context.active_object.name + file_format
-				else:
-					button_title = str(object_count) + " files"
+				if file_type == "GLB":
+					show_glb = True
 				
-				# Button icon
-				button_icon = "OUTLINER_OB_MESH"
-			
-			# Active collection fallback (except for Volume Field)
-			elif not (context.scene.vf_delivery_settings.file_type == "VF" or context.scene.vf_delivery_settings.file_type == "PNG" or context.scene.vf_delivery_settings.file_type == "EXR"):
-				# Volume Field: requires an active mesh object, collections are not supported
-				# CSV-1: count any items within the collection
-				if context.scene.vf_delivery_settings.file_type == "CSV-1":
-					object_count = len(bpy.context.collection.all_objects)
-				# Geometry: count only supported data types (mesh, curve, etcetera) for everything else
-				else:
-					object_count = len([obj for obj in bpy.context.collection.all_objects if obj.type in VF_delivery_object_types])
+				if file_type == "STL":
+					show_group = True
 				
-				# Button title
-				if context.scene.vf_delivery_settings.file_grouping == "COMBINED" and not (context.scene.vf_delivery_settings.file_type == "CSV-1" or context.scene.vf_delivery_settings.file_type == "CSV-2"):
-					button_title = bpy.context.collection.name + file_format
-				else:
-					button_title = str(object_count) + " files"
+				if file_type == "VF" or file_type == "PNG" or file_type == "EXR":
+					show_limit = True
 				
-				# Button icon
-				button_icon = "OUTLINER_COLLECTION"
-			
-			# If no usable items (CSV-1) or meshes (everything else) are found, disable the button
-			# Keeping the message generic allows this to be used universally
-			if object_count == 0:
-				button_enable = False
-				button_icon = "X"
-				if context.scene.vf_delivery_settings.file_type == "CSV-1":
-					button_title = "Select item"
-				else:
-					button_title = "Select mesh"
-			
-			# Specific display cases
-			if context.scene.vf_delivery_settings.file_type == "VF" or context.scene.vf_delivery_settings.file_type == "PNG" or context.scene.vf_delivery_settings.file_type == "EXR":
-				show_group = False
-				show_csv = False
-			
-			if context.scene.vf_delivery_settings.file_type == "PNG":
-				show_range = True
-			
-			if context.scene.vf_delivery_settings.file_type == "CSV-1":
-				show_group = False
-				show_csv = True
-			
-			if context.scene.vf_delivery_settings.file_type == "CSV-2":
-				show_group = False
-				show_csv = False
+				if file_type == "PNG":
+					show_range = True
+				
+				if file_type == "VF":
+					show_volume = True
+				
+				if file_type == "PNG" or file_type == "EXR":
+					show_strip = True
+				
+				if file_type == "EXR":
+					show_exr = True
+				
+				if file_type == "CSV-1":
+					show_csv = True
+				
+				if file_type == "CSV-2":
+					show_points = True
 			
 			# UI Layout
 			layout = self.layout
 			layout.use_property_decorate = False # No animation
 			
-			layout.prop(context.scene.vf_delivery_settings, 'file_location', text = '')
-			layout.prop(context.scene.vf_delivery_settings, 'file_type', text = '')
+			layout.prop(settings, 'file_location', text = '')
+			
+			row = layout.row(align = True)
+			if not settings.use_preset:
+				row.prop(settings, 'file_type', text = '')
+			row.prop(settings, 'use_preset', text = '' if not settings.use_preset else 'Presets', icon = 'PRESET', toggle = True)
+			
+			if settings.use_preset:
+				# Presets deliver several formats in one pass, each into its own subfolder of the delivery location
+				row = layout.row()
+				row.template_list("UI_UL_list", "vf_delivery_presets", settings, "presets", settings, "preset_index", rows = 2)
+				col = row.column(align = True)
+				col.operator(VFDELIVERY_OT_preset_add.bl_idname, text = '', icon = 'ADD')
+				col.operator(VFDELIVERY_OT_preset_remove.bl_idname, text = '', icon = 'REMOVE')
+				if preset:
+					col = layout.column(align = True)
+					for index, target in enumerate(preset.targets):
+						row = col.row(align = True)
+						row.prop(target, 'file_type', text = '')
+						row.prop(target, 'subfolder', text = '')
+						row.operator(VFDELIVERY_OT_target_remove.bl_idname, text = '', icon = 'X').index = index
+					col.operator(VFDELIVERY_OT_target_add.bl_idname, icon = 'ADD')
 			
 			if show_group:
-				layout.prop(context.scene.vf_delivery_settings, 'file_grouping', expand = True)
+				layout.prop(settings, 'file_grouping', expand = True)
+				if show_mesh:
+					layout.prop(settings, 'use_incremental')
+				if show_glb:
+					row = layout.row()
+					row.prop(settings, 'use_draco_tune')
+					sub = row.row()
+					sub.active = settings.use_draco_tune
+					sub.prop(settings, 'draco_tolerance')
+				if settings.file_grouping == "INDIVIDUAL" and show_mesh:
+					layout.prop(settings, 'instance_mode', expand = True)
+					row = layout.row()
+					row.prop(settings, 'use_parallel')
+					sub = row.row()
+					sub.active = settings.use_parallel
+					sub.prop(settings, 'parallel_workers')
 			
 			if show_range:
-				layout.prop(context.scene.vf_delivery_settings, 'data_range')
+				layout.prop(settings, 'data_range')
+			
+			if show_strip:
+				layout.prop(settings, 'strip_encoder', expand = True)
+				if settings.strip_encoder == 'DIRECT':
+					row = layout.row()
+					row.prop(settings, 'strip_channels', text = '')
+					if show_range:
+						row.prop(settings, 'png_depth', text = '')
+					if show_exr:
+						row.prop(settings, 'exr_precision', text = '')
+			
+			if show_limit:
+				layout.prop(settings, 'volume_sequence', expand = True)
+				row = layout.row(align = True)
+				row.prop(settings, 'volume_mips', text = '')
+				if settings.volume_mips == 'FACTORS':
+					row.prop(settings, 'volume_mip_factors', text = '')
+				if settings.volume_mips != 'NONE':
+					row.prop(settings, 'volume_mip_filter', text = '')
+			
+			if show_volume:
+				if settings.volume_sequence != 'CONTAINER':
+					layout.prop(settings, 'vf_version', expand = True)
+				if settings.vf_version == 'V2' or settings.volume_sequence == 'CONTAINER':
+					row = layout.row()
+					row.prop(settings, 'vf_precision', text = '')
+					row.prop(settings, 'vf_bricks', text = '')
+					row.prop(settings, 'vf_compression')
+			
+			if show_limit:
+				layout.prop(settings, 'volume_limit')
 			
 			if show_csv:
-				layout.prop(context.scene.vf_delivery_settings, 'csv_position', expand = True)
+				layout.prop(settings, 'csv_data', expand = True)
+				layout.prop(settings, 'csv_position', expand = True)
+				if settings.csv_data == 'TRANSFORM':
+					row = layout.row(align = True)
+					row.prop(settings, 'csv_rotation_mode', text = '')
+					if settings.csv_rotation_mode == 'EULER':
+						row.prop(settings, 'csv_rotation', text = '')
+					row.prop(settings, 'csv_npz', toggle = True)
+				row = layout.row()
+				row.prop(settings, 'csv_frame_step')
+				row.prop(settings, 'csv_subframes')
+			
+			if show_points:
+				layout.prop(settings, 'csv_point_format', expand = True)
 			
-			if button_enable:
-				layout.operator(VFDELIVERY_OT_file.bl_idname, text = button_title, icon = button_icon)
+			if summary['button_enable']:
+				layout.operator(VFDELIVERY_OT_file.bl_idname, text = summary['button_title'], icon = summary['button_icon'])
 			else:
 				disabled = layout.row()
 				disabled.active = False
 				disabled.enabled = False
-				disabled.operator(VFDELIVERY_OT_file.bl_idname, text = button_title, icon = button_icon)
+				disabled.operator(VFDELIVERY_OT_file.bl_idname, text = summary['button_title'], icon = summary['button_icon'])
+			
+			row = layout.row()
+			row.prop(settings, 'use_background')
+			row.prop(settings, 'use_report')
+			row.prop(settings, 'use_profile')
+			
+			row = layout.row()
+			row.prop(settings, 'use_watch')
+			sub = row.row()
+			sub.active = settings.use_watch
+			sub.prop(settings, 'watch_delay', text = '')
 			
-			if info_box:
+			if summary['info_box']:
 				box = layout.box()
 				col = box.column(align=True)
-				for line in info_box.split(','):
+				for line in summary['info_box'].split(','):
 					col.label(text=line)
 			
 		except Exception as exc:
 			print(str(exc) + " | Error in VF Delivery panel")
 
-classes = (VFDELIVERY_OT_file, vfDeliverySettings, VFTOOLS_PT_delivery)
+classes = (VFDELIVERY_OT_file, VFDELIVERY_OT_preset_add, VFDELIVERY_OT_preset_remove, VFDELIVERY_OT_target_add, VFDELIVERY_OT_target_remove, vfDeliveryTarget, vfDeliveryPreset, vfDeliverySettings, VFTOOLS_PT_delivery)
+
+###########################################################################
+# Command line delivery
+# blender -b scene.blend --python VF_delivery.py -- --format GLB --grouping INDIVIDUAL --out /deliveries --collection Props
+# blender -b --python VF_delivery.py -- --blend-dir /scenes --jobs 4 --format FBX --out /deliveries
+
+def vf_command_line(argv):
+	parser = argparse.ArgumentParser(prog='blender -b [file.blend] --python VF_delivery.py --', description='Deliver objects without the user interface')
+	parser.add_argument('--format', help='pipeline to export (FBX, GLB, OBJ, USDZ, STL, VF, PNG, EXR, CSV-1, CSV-2)')
+	parser.add_argument('--preset', help='deliver every target format in the named delivery preset (overrides --format)')
+	parser.add_argument('--grouping', choices=['COMBINED', 'INDIVIDUAL'], help='combined or individual file outputs')
+	parser.add_argument('--out', help='delivery directory (defaults to the delivery location saved in each file)')
+	parser.add_argument('--scene', help='scene name (defaults to the active scene)')
+	parser.add_argument('--collection', help='deliver all objects within the named collection')
+	parser.add_argument('--objects', nargs='+', help='deliver the named objects (the first is used as the combined file name and volume source)')
+	parser.add_argument('--name', help='override the file name used for combined outputs')
+	parser.add_argument('--set', action='append', default=[], metavar='SETTING=VALUE', help='override any other delivery setting, for example --set vf_version=V2')
+	parser.add_argument('--blend-dir', help='deliver every .blend file within a directory using separate Blender processes')
+	parser.add_argument('--jobs', type=int, default=1, help='number of concurrent Blender processes used with --blend-dir')
+	args = parser.parse_args(argv)
+	
+	if args.blend_dir:
+		return vf_command_line_batch(args, argv)
+	
+	# Apply setting overrides
+	scene = bpy.data.scenes[args.scene] if args.scene else bpy.context.scene
+	settings = scene.vf_delivery_settings
+	if args.format:
+		settings.file_type = args.format
+	if args.grouping:
+		settings.file_grouping = args.grouping
+	if args.out:
+		settings.file_location = os.path.join(os.path.abspath(args.out), '')
+	for override in args.set:
+		name, value = override.split('=', 1)
+		current = getattr(settings, name)
+		if isinstance(current, bool):
+			value = value.lower() in ('1', 'true', 'yes', 'on')
+		elif isinstance(current, (int, float, str)):
+			value = type(current)(value)
+		else:
+			value = [type(current[0])(item) for item in value.split(',')]
+		setattr(settings, name, value)
+	
+	# Resolve the object list
+	if args.objects:
+		objects = [scene.objects[name] for name in args.objects]
+		file_name = objects[0].name
+	elif args.collection:
+		collection = bpy.data.collections[args.collection]
+		objects = list(collection.all_objects)
+		file_name = collection.name
+	else:
+		objects = list(scene.collection.all_objects)
+		file_name = scene.name
+	if args.name:
+		file_name = args.name
+	
+	# Deliver each target in the named preset, or just the selected pipeline
+	if args.preset:
+		targets = vf_delivery_targets(settings, settings.presets[args.preset])
+	else:
+		targets = vf_delivery_targets(settings)
+	if not any(vf_delivery_filter(objects, file_type) for file_type, file_location in targets):
+		print("VF Delivery: no objects to deliver")
+		return 1
+	
+	errors = []
+	def report(type, message):
+		print("VF Delivery: " + message)
+		if 'ERROR' in type:
+			errors.append(message)
+	
+	# Deliver from the requested scene, even when it isn't the active one
+	view_layer = bpy.context.view_layer if scene == bpy.context.scene else scene.view_layers[0]
+	with bpy.context.temp_override(scene = scene, view_layer = view_layer):
+		# Select the objects and make the first one active for volume exports
+		context = bpy.context
+		state = VFSelectionState(context)
+		try:
+			vf_select_only(objects)
+			if context.view_layer.objects.active not in objects:
+				context.view_layer.objects.active = objects[0]
+			result = vf_run_steps(vf_deliver_targets(context, targets, vf_settings_values(settings), objects, file_name, report))
+		finally:
+			state.restore()
+	
+	if 'FINISHED' not in result or errors:
+		print("VF Delivery: failed to deliver " + bpy.data.filepath)
+		return 1
+	print("VF Delivery: delivered " + str(len(objects)) + " objects from " + (bpy.data.filepath or scene.name))
+	return 0
+
+# Deliver each .blend file within a directory, running up to the requested number of Blender processes at once
+def vf_command_line_batch(args, argv):
+	# Forward all other arguments to each process
+	forward = []
+	skip = False
+	for arg in argv:
+		if skip:
+			skip = False
+		elif arg in ('--blend-dir', '--jobs'):
+			skip = True
+		elif not arg.startswith('--blend-dir=') and not arg.startswith('--jobs='):
+			forward.append(arg)
+	
+	files = sorted(os.path.join(args.blend_dir, name) for name in os.listdir(args.blend_dir) if name.lower().endswith('.blend'))
+	pending = list(files)
+	running = []
+	failed = []
+	while pending or running:
+		while pending and len(running) < max(1, args.jobs):
+			path = pending.pop(0)
+			command = [bpy.app.binary_path, '--background', '--factory-startup', path, '--python-exit-code', '1', '--python', os.path.abspath(__file__), '--'] + forward
+			running.append((subprocess.Popen(command), path))
+		time.sleep(0.1)
+		for process, path in list(running):
+			if process.poll() is not None:
+				running.remove((process, path))
+				if process.returncode != 0:
+					failed.append(path)
+	
+	print("VF Delivery: delivered " + str(len(files) - len(failed)) + " of " + str(len(files)) + " files")
+	for path in failed:
+		print("VF Delivery: failed " + path)
+	return 1 if failed else 0
 
 ###########################################################################
 # Addon registration functions
@@ -740,12 +3069,38 @@ def register():
 	for cls in classes:
 		bpy.utils.register_class(cls)
 	bpy.types.Scene.vf_delivery_settings = bpy.props.PointerProperty(type = vfDeliverySettings)
+	bpy.app.handlers.depsgraph_update_post.append(vf_delivery_invalidate)
+	bpy.app.handlers.load_post.append(vf_delivery_invalidate)
+	bpy.app.handlers.depsgraph_update_post.append(vf_delivery_watch)
+	bpy.app.handlers.load_pre.append(vf_delivery_reset)
 	
 def unregister():
+	bpy.app.handlers.depsgraph_update_post.remove(vf_delivery_invalidate)
+	bpy.app.handlers.load_post.remove(vf_delivery_invalidate)
+	bpy.app.handlers.depsgraph_update_post.remove(vf_delivery_watch)
+	bpy.app.handlers.load_pre.remove(vf_delivery_reset)
+	vf_delivery_reset()
+	VF_summary_cache.clear()
 	for cls in reversed(classes):
 		bpy.utils.unregister_class(cls)
 	del bpy.types.Scene.vf_delivery_settings
 	
 if __name__ == "__main__":
 	register()
+	
+	# Command line arguments follow a double dash
+	args = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+	if len(args) == 2 and args[0] == '--worker':
+		# Background worker launched by vf_export_parallel
+		vf_export_worker(args[1])
+	elif args:
+		# Headless delivery, exiting with a non-zero code on failure
+		# Unknown names, invalid settings, and exporter errors are printed and fail the delivery rather than leaving Blender to exit normally
+		try:
+			code = vf_command_line(args)
+		except Exception:
+			traceback.print_exc()
+			code = 1
+		if bpy.app.background:
+			sys.exit(code)
 	
\ No newline at end of file
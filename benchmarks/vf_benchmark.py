@@ -0,0 +1,289 @@
+# VF Delivery benchmarks
+#
+# Encoding cores only (VF payload, PNG/EXR strip layout, CSV formatting), no Blender required:
+#   python benchmarks/vf_benchmark.py --cores --out cores.json
+#
+# Full delivery paths using synthetic scenes in background Blender:
+#   blender -b --factory-startup --python benchmarks/vf_benchmark.py -- --grid 64 --empties 200 --frames 250 --out delivery.json
+
+import argparse
+import ast
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ADDON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'VF_delivery.py')
+
+###########################################################################
+# Add-on loading
+
+# Load only the top-level definitions that don't depend on Blender, so the encoding cores can be timed in plain Python
+def load_cores():
+	with open(ADDON_PATH) as file:
+		tree = ast.parse(file.read(), ADDON_PATH)
+	nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.FunctionDef, ast.ClassDef, ast.Assign))]
+	
+	def defined(node):
+		if isinstance(node, ast.Import):
+			return {(alias.asname or alias.name).split('.')[0] for alias in node.names}
+		if isinstance(node, ast.Assign):
+			return {target.id for target in node.targets if isinstance(target, ast.Name)}
+		return {node.name}
+	
+	def used(node):
+		return {child.id for child in ast.walk(node) if isinstance(child, ast.Name)}
+	
+	# Exclude anything that refers to Blender modules, directly or through other excluded definitions
+	excluded = {'bpy', 'mathutils', 'persistent'}
+	changed = True
+	while changed:
+		changed = False
+		for node in nodes:
+			if not isinstance(node, ast.Import) and not defined(node) <= excluded and used(node) & excluded:
+				excluded |= defined(node)
+				changed = True
+	
+	body = []
+	for node in nodes:
+		if isinstance(node, ast.Import):
+			node.names = [alias for alias in node.names if alias.name.split('.')[0] not in excluded]
+			if node.names:
+				body.append(node)
+		elif not defined(node) <= excluded:
+			body.append(node)
+	
+	module = type(sys)('VF_delivery_cores')
+	exec(compile(ast.Module(body=body, type_ignores=[]), ADDON_PATH, 'exec'), module.__dict__)
+	return module
+
+# Load the complete add-on inside Blender
+def load_addon():
+	spec = importlib.util.spec_from_file_location('VF_delivery', ADDON_PATH)
+	module = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+	module.register()
+	return module
+
+###########################################################################
+# Timing
+
+def measure(function, repeat=3):
+	times = []
+	for i in range(repeat):
+		start = time.perf_counter()
+		function()
+		times.append(time.perf_counter() - start)
+	return min(times)
+
+def directory_bytes(path):
+	return sum(os.path.getsize(os.path.join(root, name)) for root, dirs, files in os.walk(path) for name in files)
+
+###########################################################################
+# Encoding cores
+
+def benchmark_cores(vf, grids, points, repeat):
+	results = []
+	directory = tempfile.mkdtemp(prefix='vf_benchmark_')
+	rng = np.random.default_rng(0)
+	
+	# Writers that add their own extension (np.save) need it in the path, so file sizes are measured on the file actually written
+	def record(name, size, function, extension=''):
+		path = os.path.join(directory, name.replace(' ', '_') + extension)
+		seconds = measure(lambda: function(path), repeat)
+		results.append({'case': name, 'size': size, 'seconds': seconds, 'bytes': os.path.getsize(path) if os.path.exists(path) else 0})
+		print(f"{name:<24} {size:>10} {seconds:9.4f}s")
+	
+	try:
+		for grid in grids:
+			size = (grid, grid, grid)
+			vectors = rng.uniform(-1.0, 1.0, (grid ** 3, 3)).astype(np.float32)
+			strip = vf.vf_strip_encode(vectors, size, 'PNG', -1.0, 1.0)
+			record('vf v1', grid, lambda path: vf.vf_write_volume_field(path, vectors, size))
+			record('vf v2 float16', grid, lambda path: vf.vf_write_volume_field_v2(path, vectors, size, 'FLOAT16'))
+			record('vf v2 zlib', grid, lambda path: vf.vf_write_volume_field_v2(path, vectors, size, 'FLOAT32', True))
+			record('vf read', grid, lambda path: np.asarray(vf.vf_read_volume_field(os.path.join(directory, 'vf_v1'))[2]).sum())
+			
+			# Force field that is empty outside a central region, as with most point array volumes
+			sparse = np.zeros((grid, grid, grid, 3), dtype=np.float32)
+			sparse[grid // 4:grid // 2, grid // 4:grid // 2, grid // 4:grid // 2] = rng.uniform(-1.0, 1.0, (grid // 2 - grid // 4,) * 3 + (3,))
+			sparse = sparse.reshape((-1, 3))
+			record('vf v2 dense', grid, lambda path: vf.vf_write_volume_field_v2(path, sparse, size))
+			record('vf v2 sparse', grid, lambda path: vf.vf_write_volume_field_v2(path, sparse, size, 'FLOAT32', False, 8))
+			record('vf sparse read', grid, lambda path: vf.vf_read_volume_field(os.path.join(directory, 'vf_v2_sparse'))[2].sum())
+			record('strip layout', grid, lambda path: vf.vf_strip_encode(vectors, size, 'PNG', -1.0, 1.0, 3, strip))
+			record('png strip', grid, lambda path: vf.vf_write_png(path, vf.vf_strip_encode(vectors, size, 'PNG', -1.0, 1.0, 3, strip)))
+			record('exr strip', grid, lambda path: vf.vf_write_exr(path, vf.vf_strip_encode(vectors, size, 'EXR', -1.0, 1.0, 3, strip)))
+		
+		for count in points:
+			positions = rng.uniform(-10.0, 10.0, (count, 3)).astype(np.float32)
+			record('csv points', count, lambda path: vf.vf_write_points(path, positions, 'CSV'), '.csv')
+			record('ply points', count, lambda path: vf.vf_write_points(path, positions, 'PLY'), '.ply')
+			record('npy points', count, lambda path: vf.vf_write_points(path, positions, 'NPY'), '.npy')
+			
+			# Binary STL records for a mesh with about twice as many triangles as vertices
+			triangles = rng.integers(0, count, (count * 2, 3), dtype=np.int32)
+			def write_stl(path):
+				with open(path, 'wb') as file:
+					vf.vf_write_stl_triangles(file, positions, triangles)
+			record('stl triangles', count * 2, write_stl, '.stl')
+	finally:
+		shutil.rmtree(directory, ignore_errors=True)
+	return results
+
+###########################################################################
+# Synthetic scenes (Blender only)
+
+def clear_scene(bpy):
+	bpy.ops.wm.read_factory_settings(use_empty=True)
+
+# Point grid matching the VF-PointArray cubic grid output, with a field_vector attribute
+def create_point_grid(bpy, grid):
+	count = grid ** 3
+	mesh = bpy.data.meshes.new('VolumeField')
+	mesh.vertices.add(count)
+	axis = np.linspace(-1.0, 1.0, grid, dtype=np.float32)
+	y, z, x = np.meshgrid(axis, axis, axis, indexing='ij')
+	positions = np.stack((x, y, z), axis=-1).reshape(-1)
+	mesh.vertices.foreach_set('co', positions)
+	mesh['vf_point_grid_x'] = grid
+	mesh['vf_point_grid_y'] = grid
+	mesh['vf_point_grid_z'] = grid
+	attribute = mesh.attributes.new('field_vector', 'FLOAT_VECTOR', 'POINT')
+	attribute.data.foreach_set('vector', np.random.default_rng(0).uniform(-1.0, 1.0, count * 3).astype(np.float32))
+	mesh.update()
+	obj = bpy.data.objects.new('VolumeField', mesh)
+	bpy.context.scene.collection.objects.link(obj)
+	return obj
+
+# Animated empties for item position sampling
+def create_empties(bpy, count, frames):
+	scene = bpy.context.scene
+	scene.frame_start = 1
+	scene.frame_end = frames
+	objects = []
+	rng = np.random.default_rng(0)
+	for i in range(count):
+		obj = bpy.data.objects.new('Empty_' + str(i), None)
+		scene.collection.objects.link(obj)
+		for frame in (1, frames // 2, frames):
+			obj.location = rng.uniform(-10.0, 10.0, 3)
+			obj.keyframe_insert('location', frame=frame)
+		objects.append(obj)
+	return objects
+
+# Grid mesh with approximately the requested number of vertices
+def create_mesh(bpy, vertices):
+	side = max(2, int(round(vertices ** 0.5)))
+	bpy.ops.mesh.primitive_grid_add(x_subdivisions=side - 1, y_subdivisions=side - 1, size=2.0)
+	obj = bpy.context.active_object
+	obj.name = 'Mesh_' + str(len(obj.data.vertices))
+	return obj
+
+###########################################################################
+# Delivery paths (Blender only)
+
+def benchmark_delivery(bpy, vf, grid, empties, frames, meshes):
+	results = []
+	directory = tempfile.mkdtemp(prefix='vf_benchmark_')
+	
+	def deliver(case, format, objects, grouping='COMBINED', **overrides):
+		settings = bpy.context.scene.vf_delivery_settings
+		output = os.path.join(directory, case.replace(' ', '_'), '')
+		settings.file_location = output
+		settings.file_type = format
+		settings.file_grouping = grouping
+		for name, value in overrides.items():
+			setattr(settings, name, value)
+		vf.vf_select_only(objects)
+		bpy.context.view_layer.objects.active = objects[0]
+		stats = vf.VFDeliveryStats(True)
+		messages = []
+		try:
+			status = vf.vf_deliver(bpy.context, objects, objects[0].name, lambda type, message: messages.append(message), stats)
+			error = None if 'FINISHED' in status else 'cancelled'
+		except Exception as exc:
+			error = str(exc)
+		stats.finish()
+		result = {
+			'case': case,
+			'format': format,
+			'seconds': stats.seconds,
+			'bytes': directory_bytes(output) if os.path.isdir(output) else 0,
+			'stages': stats.stages,
+			'error': error,
+			}
+		results.append(result)
+		print(f"{case:<32} {stats.seconds:9.4f}s" + (" " + error if error else ""))
+	
+	try:
+		clear_scene(bpy)
+		volume = create_point_grid(bpy, grid)
+		bpy.context.scene.vf_delivery_settings.volume_limit = max(grid ** 3, vf.VF_volume_limit)
+		for format in ('VF', 'PNG', 'EXR'):
+			deliver(format.lower() + ' ' + str(grid), format, [volume])
+		deliver('vf v2 zlib ' + str(grid), 'VF', [volume], vf_version='V2', vf_compression=True)
+		
+		clear_scene(bpy)
+		objects = create_empties(bpy, empties, frames)
+		deliver('csv items ' + str(empties) + 'x' + str(frames), 'CSV-1', objects)
+		
+		for count in meshes:
+			clear_scene(bpy)
+			obj = create_mesh(bpy, count)
+			deliver('csv points ' + str(count), 'CSV-2', [obj])
+			deliver('stl ' + str(count), 'STL', [obj])
+			for format in ('FBX', 'GLB', 'OBJ', 'USDZ'):
+				deliver(format.lower() + ' ' + str(count), format, [obj])
+	finally:
+		shutil.rmtree(directory, ignore_errors=True)
+	return results
+
+###########################################################################
+# Entry point
+
+def main(argv, in_blender):
+	parser = argparse.ArgumentParser(description='Benchmark VF Delivery export paths')
+	parser.add_argument('--cores', action='store_true', help='benchmark only the NumPy encoding cores (implied outside of Blender)')
+	parser.add_argument('--grid', type=int, nargs='+', default=[32, 64], help='volume grid sizes (points per axis)')
+	parser.add_argument('--points', type=int, nargs='+', default=[100000, 1000000], help='point counts for the core point writers')
+	parser.add_argument('--empties', type=int, default=100, help='number of animated empties for item positions')
+	parser.add_argument('--frames', type=int, default=250, help='number of frames for item positions')
+	parser.add_argument('--meshes', type=int, nargs='+', default=[10000, 100000, 1000000], help='vertex counts for point, STL, and mesh exports')
+	parser.add_argument('--repeat', type=int, default=3, help='repetitions for core timings (the fastest is kept)')
+	parser.add_argument('--out', help='JSON results file (printed to stdout if not set)')
+	args = parser.parse_args(argv)
+	
+	results = {
+		'python': platform.python_version(),
+		'numpy': np.__version__,
+		'platform': platform.platform(),
+		}
+	
+	if args.cores or not in_blender:
+		results['cores'] = benchmark_cores(load_cores(), args.grid, args.points, args.repeat)
+	else:
+		import bpy
+		results['blender'] = bpy.app.version_string
+		results['delivery'] = benchmark_delivery(bpy, load_addon(), args.grid[-1], args.empties, args.frames, args.meshes)
+	
+	text = json.dumps(results, indent='\t')
+	if args.out:
+		with open(args.out, 'w') as file:
+			file.write(text)
+	else:
+		print(text)
+
+if __name__ == "__main__":
+	try:
+		import bpy
+		in_blender = True
+	except ImportError:
+		in_blender = False
+	main(sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else ([] if in_blender else sys.argv[1:]), in_blender)